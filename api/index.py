@@ -4,6 +4,7 @@ This file adapts the FastAPI application to work with Vercel's serverless functi
 """
 import sys
 import os
+import time
 from pathlib import Path
 
 # Set the VERCEL environment variable
@@ -21,58 +22,24 @@ except Exception as e:
     print(f"❌ Error importing FastAPI app: {e}")
     raise
 
-# Initialize database tables and load seed data if needed
+# Initialize the database: restore the prebuilt reference-data snapshot (backend/snapshot.py)
+# into /tmp on a cold start, then load whichever datasets data_manifest lists as missing or
+# stale - none after a current snapshot, all of them when it is missing or stale
 try:
-    from database import Base, engine, SessionLocal, Area, Dimension, MaturityLevel, RatingScale
-    Base.metadata.create_all(bind=engine)
-    print("✅ Database tables created")
-    
-    # Auto-load seed data if database is empty (for Vercel deployments)
-    db = SessionLocal()
-    try:
-        area_count = db.query(Area).count()
-        dimension_count = db.query(Dimension).count()
-        maturity_count = db.query(MaturityLevel).count()
-        rating_count = db.query(RatingScale).count()
-        
-        if area_count == 0 or dimension_count == 0 or maturity_count == 0 or rating_count == 0:
-            print("📊 Vercel deployment: Database is empty. Loading all data...")
-            
-            # Load base seed data
-            from seed_data import load_seed_data
-            load_seed_data()
-            print("✅ Base seed data loaded")
-            
-            # Load maturity levels (checksheet data)
-            try:
-                from load_simulated_data import load_simulated_data
-                load_simulated_data()
-                print("✅ Maturity levels data loaded")
-            except Exception as e:
-                print(f"⚠️ Maturity levels loading error: {e}")
-            
-            # Load rating scales
-            try:
-                from update_rating_scales import update_rating_scales
-                update_rating_scales()
-                print("✅ Rating scales data loaded")
-            except Exception as e:
-                print(f"⚠️ Rating scales loading error: {e}")
-            
-            # Load reports data (areas/dimensions)
-            try:
-                from load_reports_data import load_reports_data
-                load_reports_data()
-                print("✅ Reports data loaded")
-            except Exception as e:
-                print(f"⚠️ Reports data loading error: {e}")
-            
-            print("✅ All data loaded for Vercel deployment!")
-    except Exception as seed_error:
-        print(f"⚠️ Seed data loading error: {seed_error}")
-    finally:
-        db.close()
-        
+    from database import DB_PATH, init_db
+    from data_manifest import REFERENCE_DATASETS, ensure_datasets
+    from jobs import job_runner
+    from snapshot import restore_snapshot
+    start = time.perf_counter()
+    restored = restore_snapshot(DB_PATH)
+    init_db()
+    interrupted = job_runner.recover_interrupted()
+    if interrupted:
+        print(f"⚠️ Marked {interrupted} interrupted background job(s) as failed")
+    datasets = ensure_datasets(REFERENCE_DATASETS)
+    changes = ", ".join(f"{name} {status}" for name, status in datasets.items() if status != "current")
+    print(f"✅ Database ready ({restored} snapshot, {changes or 'data current'}) "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms")
 except Exception as e:
     print(f"⚠️ Database initialization warning: {e}")
 
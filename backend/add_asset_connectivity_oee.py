@@ -3,6 +3,9 @@ Script to add Asset Connectivity & OEE rating scale to the database
 This adds the dimension and its 5 maturity levels as specified in requirements
 """
 from database import SessionLocal, RatingScale, Dimension, Area
+from area_summary import apply_dimension_change
+from table_sync import sync_table
+from reference_cache import bump_generation, AREAS, RATING_SCALES
 from sqlalchemy.orm import Session
 
 # Asset Connectivity & OEE rating scale data
@@ -70,30 +73,21 @@ def add_asset_connectivity_dimension():
                 desired_level=3
             )
             db.add(new_dimension)
+            apply_dimension_change(db, default_area.id, None, (new_dimension.current_level, new_dimension.desired_level))
             db.commit()
+            bump_generation(AREAS)
             print(f"✅ Created dimension: {ASSET_CONNECTIVITY_DATA['dimension_name']}")
         else:
             print(f"ℹ️  Dimension already exists: {ASSET_CONNECTIVITY_DATA['dimension_name']}")
         
-        # Delete existing rating scales for this dimension
-        db.query(RatingScale).filter(
-            RatingScale.dimension_name == ASSET_CONNECTIVITY_DATA["dimension_name"]
-        ).delete()
-        db.commit()
-        print(f"🗑️  Cleared existing rating scales for {ASSET_CONNECTIVITY_DATA['dimension_name']}")
-        
-        # Add rating scales for all 5 levels
-        for level_data in ASSET_CONNECTIVITY_DATA["levels"]:
-            rating_scale = RatingScale(
-                dimension_name=ASSET_CONNECTIVITY_DATA["dimension_name"],
-                level=level_data["level"],
-                rating_name=level_data["rating_name"],
-                digital_maturity_description=level_data["digital_maturity_description"],
-                business_relevance=level_data["business_relevance"]
-            )
-            db.add(rating_scale)
-        
+        # Sync the rating scales of this dimension (and no other) to the 5 levels
+        changes = sync_table(db, RatingScale, [
+            {"dimension_name": ASSET_CONNECTIVITY_DATA["dimension_name"], **level_data}
+            for level_data in ASSET_CONNECTIVITY_DATA["levels"]
+        ], where=RatingScale.dimension_name == ASSET_CONNECTIVITY_DATA["dimension_name"])
         db.commit()
+        print(f"🔄 Rating scales for {ASSET_CONNECTIVITY_DATA['dimension_name']}: {changes.counts()}")
+        bump_generation(RATING_SCALES)
         print(f"✅ Added {len(ASSET_CONNECTIVITY_DATA['levels'])} rating scales for {ASSET_CONNECTIVITY_DATA['dimension_name']}")
         
         # Display the added data
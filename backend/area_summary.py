@@ -0,0 +1,124 @@
+"""
+Maintenance of the area_summary table behind GET /api/mm/reports/summary
+Every writer that changes a Dimension keeps the per-area counters in step inside its own
+transaction: single-dimension edits apply a delta to one row, bulk writes and data refreshes
+recompute the affected areas with one GROUP BY. check_area_summary.py rebuilds the table from
+scratch and compares it with what is stored.
+"""
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from database import Area, AreaSummary, Dimension
+from reports import format_area_summary
+
+COUNTER_COLUMNS = ("total_dimensions", "current_level_sum", "on_track_count", "completed_count")
+
+
+def dimension_counters(current_level: int, desired_level: int) -> dict:
+    """Contribution of a single dimension to its area's counters"""
+    return {
+        "total_dimensions": 1,
+        "current_level_sum": current_level,
+        "on_track_count": int(current_level >= desired_level - 1),
+        "completed_count": int(current_level >= desired_level),
+    }
+
+
+def apply_dimension_change(
+    db: Session, area_id: Optional[int], before: Optional[Tuple], after: Optional[Tuple]
+) -> None:
+    """
+    Move an area's counters by the difference between two states of one dimension.
+    before/after: (current_level, desired_level), or None when the dimension is added/removed.
+    """
+    if area_id is None:
+        return
+    deltas = dict.fromkeys(COUNTER_COLUMNS, 0)
+    for state, sign in ((before, -1), (after, 1)):
+        if state is not None:
+            for column, value in dimension_counters(*state).items():
+                deltas[column] += sign * value
+    changes = {column: getattr(AreaSummary, column) + delta for column, delta in deltas.items() if delta}
+    if not changes:
+        return
+
+    result = db.execute(
+        update(AreaSummary)
+        .where(AreaSummary.area_id == area_id)
+        .values(updated_at=datetime.utcnow(), **changes)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        # Area not materialized yet - recompute it, or everything on a never-populated table
+        populated = db.execute(select(AreaSummary.area_id).limit(1)).first() is not None
+        refresh_area_summaries(db, [area_id] if populated else None)
+
+
+def refresh_area_summaries(db: Session, area_ids: Optional[Iterable[int]] = None) -> int:
+    """Recompute the summary rows of the given areas (all areas when None); returns rows written"""
+    db.flush()
+    on_track = case((Dimension.current_level >= Dimension.desired_level - 1, 1), else_=0)
+    completed = case((Dimension.current_level >= Dimension.desired_level, 1), else_=0)
+    query = (
+        select(
+            Area.id, Area.name, Area.desired_level,
+            func.count(Dimension.id),
+            func.coalesce(func.sum(Dimension.current_level), 0),
+            func.coalesce(func.sum(on_track), 0),
+            func.coalesce(func.sum(completed), 0),
+        )
+        .outerjoin(Dimension, Dimension.area_id == Area.id)
+        .group_by(Area.id)
+    )
+    clear = delete(AreaSummary)
+    if area_ids is not None:
+        area_ids = sorted({area_id for area_id in area_ids if area_id is not None})
+        if not area_ids:
+            return 0
+        query = query.where(Area.id.in_(area_ids))
+        clear = clear.where(AreaSummary.area_id.in_(area_ids))
+
+    rows = db.execute(query).all()
+    db.execute(clear.execution_options(synchronize_session=False))
+    if rows:
+        now = datetime.utcnow()
+        db.execute(insert(AreaSummary), [
+            {
+                "area_id": area_id, "area_name": name, "desired_level": desired_level,
+                "total_dimensions": total, "current_level_sum": level_sum,
+                "on_track_count": on_track_count, "completed_count": completed_count,
+                "updated_at": now
+            }
+            for area_id, name, desired_level, total, level_sum, on_track_count, completed_count in rows
+        ])
+    return len(rows)
+
+
+def refresh_summaries_for_dimensions(db: Session, dimension_ids: Iterable[int]) -> int:
+    """Recompute the areas owning the given dimensions, e.g. after a bulk level update"""
+    dimension_ids = list(dimension_ids)
+    if not dimension_ids:
+        return 0
+    area_ids = db.execute(
+        select(Dimension.area_id).where(Dimension.id.in_(dimension_ids)).distinct()
+    ).scalars().all()
+    return refresh_area_summaries(db, area_ids)
+
+
+def summary_response(row: AreaSummary) -> dict:
+    return format_area_summary(
+        row.area_id, row.area_name, row.desired_level, row.total_dimensions,
+        row.current_level_sum, row.on_track_count, row.completed_count
+    )
+
+
+def summary_rows(db: Session) -> List[dict]:
+    """Read the materialized summary; builds it first on a database that has never been summarized"""
+    rows = db.execute(select(AreaSummary).order_by(AreaSummary.area_id)).scalars().all()
+    if not rows and refresh_area_summaries(db):
+        db.commit()
+        rows = db.execute(select(AreaSummary).order_by(AreaSummary.area_id)).scalars().all()
+    return [summary_response(row) for row in rows]
@@ -0,0 +1,55 @@
+"""
+Optional async database stack (sqlite+aiosqlite) for the hot read endpoints
+Enabled with MM_DB_ASYNC=1; requires aiosqlite and greenlet, which are not in requirements.txt
+(pip install -r requirements-async.txt). Only imported when the flag is set, and the engine is
+created on first use, so the sync stack never imports aiosqlite.
+"""
+import importlib.util
+
+_missing = [package for package in ("aiosqlite", "greenlet") if importlib.util.find_spec(package) is None]
+if _missing:
+    raise ImportError(
+        f"MM_DB_ASYNC=1 needs {' and '.join(_missing)}: pip install -r requirements-async.txt "
+        f"(or unset MM_DB_ASYNC to use the sync stack)"
+    )
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from database import DB_PATH, sqlite_pragmas_from_env
+
+ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{DB_PATH}"
+
+_async_engine = None
+_async_session_factory = None
+
+
+def create_async_db_engine(url=ASYNC_DATABASE_URL, pragmas=None):
+    """Build an aiosqlite engine with the same PRAGMA tuning as the sync engine"""
+    if pragmas is None:
+        pragmas = sqlite_pragmas_from_env()
+    async_engine = create_async_engine(url)
+
+    if pragmas:
+        @event.listens_for(async_engine.sync_engine, "connect")
+        def apply_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma, value in pragmas.items():
+                cursor.execute(f"PRAGMA {pragma}={value}")
+            cursor.close()
+
+    return async_engine
+
+
+def get_async_session_factory():
+    global _async_engine, _async_session_factory
+    if _async_session_factory is None:
+        _async_engine = create_async_db_engine()
+        _async_session_factory = async_sessionmaker(_async_engine, class_=AsyncSession, expire_on_commit=False)
+    return _async_session_factory
+
+
+# Dependency
+async def get_async_db():
+    async with get_async_session_factory()() as db:
+        yield db
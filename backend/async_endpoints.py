@@ -0,0 +1,68 @@
+"""
+Async versions of the hot read endpoints, served when MM_DB_ASYNC=1
+Relationships are eager-loaded because lazy loads cannot run under an AsyncSession.
+"""
+from typing import List
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from async_database import get_async_db
+from area_summary import refresh_area_summaries, summary_response
+from database import Area, AreaSummary, ChecksheetSelection, MaturityLevel, RatingScale
+from reference_cache import cached_response_async, IfNoneMatch, AREAS, MATURITY_LEVELS, RATING_SCALES
+from schemas import AreaResponse, ChecksheetSelectionResponse, MaturityLevelResponse, RatingScaleResponse
+
+router = APIRouter()
+
+
+@router.get("/api/mm/areas", response_model=List[AreaResponse])
+async def get_areas(db: AsyncSession = Depends(get_async_db), if_none_match: IfNoneMatch = None):
+    """Get all manufacturing areas with their dimensions"""
+    async def load():
+        result = await db.execute(select(Area).options(selectinload(Area.dimensions)))
+        return [AreaResponse.from_orm(area) for area in result.scalars().all()]
+    return await cached_response_async(AREAS, ("areas",), load, if_none_match)
+
+
+@router.get("/api/mm/maturity-levels", response_model=List[MaturityLevelResponse])
+async def get_maturity_levels(dimension_id: int = None, db: AsyncSession = Depends(get_async_db), if_none_match: IfNoneMatch = None):
+    """Get maturity level definitions, optionally filtered by dimension"""
+    async def load():
+        query = select(MaturityLevel)
+        if dimension_id:
+            query = query.where(MaturityLevel.dimension_id == dimension_id)
+        result = await db.execute(query.order_by(MaturityLevel.level, MaturityLevel.sub_level))
+        return [MaturityLevelResponse.from_orm(level) for level in result.scalars().all()]
+    return await cached_response_async(MATURITY_LEVELS, ("maturity-levels", dimension_id), load, if_none_match)
+
+
+@router.get("/api/mm/rating-scales", response_model=List[RatingScaleResponse])
+async def get_rating_scales(db: AsyncSession = Depends(get_async_db), if_none_match: IfNoneMatch = None):
+    """Get all rating scale definitions"""
+    async def load():
+        result = await db.execute(select(RatingScale).order_by(RatingScale.dimension_name, RatingScale.level))
+        return [RatingScaleResponse.from_orm(scale) for scale in result.scalars().all()]
+    return await cached_response_async(RATING_SCALES, ("rating-scales",), load, if_none_match)
+
+
+@router.get("/api/mm/reports/summary")
+async def get_reports_summary(db: AsyncSession = Depends(get_async_db)):
+    """Get summary statistics for all areas (served from the area_summary table)"""
+    query = select(AreaSummary).order_by(AreaSummary.area_id)
+    rows = (await db.execute(query)).scalars().all()
+    if not rows and await db.run_sync(refresh_area_summaries):
+        await db.commit()
+        rows = (await db.execute(query)).scalars().all()
+    return [summary_response(row) for row in rows]
+
+
+@router.get("/api/mm/checksheet-selections/{assessment_id}", response_model=List[ChecksheetSelectionResponse])
+async def get_checksheet_selections(assessment_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Get all checksheet selections for an assessment"""
+    result = await db.execute(
+        select(ChecksheetSelection).where(ChecksheetSelection.assessment_id == assessment_id)
+    )
+    return result.scalars().all()
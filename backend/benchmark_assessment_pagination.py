@@ -0,0 +1,135 @@
+"""
+Benchmark: GET /api/mm/assessments - full list vs keyset pages vs field projection
+Fills a scratch database with 100k assessments (notes blobs included), then times through
+the HTTP stack:
+  - the unpaginated list (every row, every column)
+  - the first page and a page deep in the table, via limit/cursor
+  - the deep page's SQL alone, keyset vs OFFSET
+  - a projected page (fields=id,plant_name,shop_unit,created_at)
+  - a filtered page (plant_name + shop_unit)
+
+Usage:
+    python benchmark_assessment_pagination.py [--rows 100000] [--page-size 50] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from database import Assessment, create_db_engine, get_db, init_db
+from main import app
+from pagination import after_cursor_desc, encode_cursor
+
+PLANTS = ["Nashik", "Chakan", "Zaheerabad", "Haridwar"]
+SHOP_UNITS = ["Press Shop", "BIW 1", "BIW 2", "Paint Shop 1", "Assembly Line 1", "Assembly Line 2"]
+
+
+def build_database(path, rows, seed=5):
+    rng = random.Random(seed)
+    engine = create_db_engine(f"sqlite:///{path}")
+    init_db(engine)
+    notes = "Observation " * 40  # ~500 bytes per notes column
+    start = datetime(2024, 1, 1)
+    batch = []
+    with engine.begin() as conn:
+        for i in range(rows):
+            created_at = start + timedelta(minutes=i * 5 + rng.randint(0, 4))
+            batch.append({
+                "plant_name": rng.choice(PLANTS), "shop_unit": rng.choice(SHOP_UNITS),
+                "assessor_name": f"Assessor {i % 40}", "assessment_date": created_at,
+                "notes": notes, "level1_notes": notes, "level2_notes": notes, "level3_notes": notes,
+                "level4_notes": notes, "level5_notes": notes,
+                "level1_image": f"/images/{i}/1.png", "level2_image": f"/images/{i}/2.png",
+                "created_at": created_at, "updated_at": created_at,
+            })
+            if len(batch) == 5000:
+                conn.execute(insert(Assessment), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Assessment), batch)
+    return engine
+
+
+def timed(client, params, repeat):
+    best, size = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get("/api/mm/assessments", params=params)
+        best = min(best, time.perf_counter() - start)
+        size = len(response.content)
+        assert response.status_code == 200, response.text
+    return best, size, response
+
+
+def report(label, seconds, size):
+    print(f"{label:34} {seconds * 1000:10.1f} ms {size / 1024:12,.1f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_database(os.path.join(tmp, "bench.db"), args.rows)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        def override_get_db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        client = TestClient(app)
+        try:
+            print(f"{args.rows} assessments, page size {args.page_size}\n")
+            report("full list (no pagination)", *timed(client, {}, 1)[:2])
+
+            page = {"limit": args.page_size}
+            report("first page", *timed(client, page, args.repeat)[:2])
+
+            # Cursor for a page ~90% of the way through the table
+            deep_offset = int(args.rows * 0.9)
+            db = Session()
+            anchor = db.query(Assessment.id, Assessment.created_at).order_by(
+                Assessment.created_at.desc(), Assessment.id.desc()
+            ).offset(deep_offset - 1).first()
+            db.close()
+            deep_cursor = encode_cursor(anchor.created_at, anchor.id)
+            report(f"page at row {deep_offset:,} (cursor)", *timed(client, {**page, "cursor": deep_cursor}, args.repeat)[:2])
+
+            db = Session()
+            newest_first = (Assessment.created_at.desc(), Assessment.id.desc())
+            keyset = db.query(Assessment).filter(
+                after_cursor_desc(Assessment.created_at, Assessment.id, deep_cursor)
+            ).order_by(*newest_first).limit(args.page_size)
+            offset = db.query(Assessment).order_by(*newest_first).offset(deep_offset).limit(args.page_size)
+            for label, query in (("keyset", keyset), ("OFFSET", offset)):
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    query.all()
+                    db.expunge_all()
+                report(f"  same page, SQL only ({label})", (time.perf_counter() - start) / args.repeat, 0)
+            db.close()
+
+            fields = "id,plant_name,shop_unit,created_at"
+            report("first page, fields projection", *timed(client, {**page, "fields": fields}, args.repeat)[:2])
+            report("filtered page (plant + shop unit)",
+                   *timed(client, {**page, "plant_name": PLANTS[0], "shop_unit": SHOP_UNITS[0]}, args.repeat)[:2])
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
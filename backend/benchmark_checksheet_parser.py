@@ -0,0 +1,179 @@
+"""
+Benchmark: vectorized checksheet/report parsing (checksheet_parser.py) vs the iterrows loops
+Builds synthetic CheckSheet and Reports sheets (100k rows each by default) in the layout of
+the bundled workbooks - title/plant/date rows, "Level N: ..." headers, 1.1 categories, 1.1a
+criteria, blank and malformed rows - then checks that both parsers produce the same records
+and times them.
+
+Usage:
+    python benchmark_checksheet_parser.py [--rows 100000] [--repeat 3]
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from checksheet_parser import maturity_level_records, parse_checksheet_frame, parse_report_frame, report_areas
+
+
+def legacy_parse_checksheet(df):
+    """The row-by-row CheckSheet loop of load_checksheet_data, without its prints"""
+    records = []
+    current_level = None
+    current_category = None
+    for idx, row in df.iterrows():
+        col0 = str(row[0]).strip() if pd.notna(row[0]) else ""
+        col1 = str(row[1]).strip() if pd.notna(row[1]) else ""
+        col2 = str(row[2]).strip() if pd.notna(row[2]) else ""
+        if not col0 and not col1:
+            continue
+        if "Check Sheet for Smart Factory" in col0:
+            continue
+        if "Plant:" in col0 or "Date:" in col0:
+            continue
+        if col1 == "Remarks" or col2 == "Press Shop":
+            continue
+        if "Level" in col1 and ":" in col1:
+            for n in range(1, 6):
+                if f"Level {n}" in col1:
+                    current_level = n
+                    break
+            level_name = col1.split(":", 1)[1].strip()
+            records.append(dict(level=current_level, name=level_name, sub_level=None, category=None,
+                                description=f"Level {current_level}: {level_name}"))
+            continue
+        if col0 and not any(c.isalpha() for c in col0):
+            try:
+                parts = col0.split('.')
+                if len(parts) == 2:
+                    main_num = int(parts[0])
+                    int(parts[1])
+                    current_category = col1
+                    if current_category:
+                        records.append(dict(level=main_num, name=current_category, sub_level=col0,
+                                            category=current_category, description=current_category))
+                    continue
+            except (ValueError, IndexError):
+                pass
+        if col0 and any(c.isalpha() for c in col0):
+            try:
+                parts = col0.rstrip('abcdefghijklmnopqrstuvwxyz').split('.')
+                if len(parts) == 2:
+                    main_num = int(parts[0])
+                    if col1:
+                        records.append(dict(level=main_num, name=col1[:100], sub_level=col0,
+                                            category=current_category, description=col1))
+            except (ValueError, IndexError):
+                continue
+    return records
+
+
+def legacy_parse_reports(df):
+    """The row-by-row Reports loop of refresh_reports_data"""
+    areas = []
+    for idx, row in df.iterrows():
+        if idx < 3:
+            continue
+        area_name = str(row[0]) if pd.notna(row[0]) else ""
+        col1_value = str(row[1]) if pd.notna(row[1]) else ""
+        col8_value = row[8] if pd.notna(row[8]) else None
+        if area_name and area_name != "nan":
+            desired_level = 3
+            if col8_value and str(col8_value) != "nan":
+                try:
+                    desired_level = int(float(col8_value))
+                except Exception:
+                    pass
+            areas.append({"name": area_name, "desired_level": desired_level, "dimensions": []})
+            if col1_value and col1_value != "nan" and col1_value != "Dimension":
+                areas[-1]["dimensions"].append(col1_value)
+            continue
+        if areas and col1_value and col1_value != "nan" and col1_value != "Dimension":
+            areas[-1]["dimensions"].append(col1_value)
+    return areas
+
+
+def synthetic_checksheet(rows, seed=11):
+    rng = random.Random(seed)
+    data = [
+        ["Check Sheet for Smart Factory", None, None, None],
+        ["Plant: Nashik", None, None, None],
+        ["Date: 2024-01-01", None, None, None],
+        [None, "Remarks", "Press Shop", None],
+    ]
+    level, category, criterion = 0, 0, 0
+    while len(data) < rows:
+        roll = rng.random()
+        if roll < 0.01 or level == 0:
+            level = level % 5 + 1
+            category = 0
+            text = f"Level {level}: Stage {len(data)}" if rng.random() > 0.1 else f"Stage {len(data)}: Level review"
+            data.append([None, text, None, None])
+        elif roll < 0.08:
+            category += 1
+            criterion = 0
+            name = f"  Category {level}.{category} " if rng.random() > 0.05 else None
+            data.append([f"{level}.{category}", name, None, None])
+        elif roll < 0.1:
+            data.append([None, None, None, None] if rng.random() < 0.5 else ["n/a", "Note", None, None])
+        else:
+            criterion += 1
+            code = f"{level}.{category}{'abcdefgh'[criterion % 8]}"
+            description = f"Criterion {len(data)} " + "detail " * rng.randint(0, 30)
+            data.append([code, description if rng.random() > 0.02 else None,
+                         str(rng.randint(0, 5)), "evidence" if rng.random() < 0.3 else None])
+    return pd.DataFrame(data[:rows], dtype=object)
+
+
+def synthetic_reports(rows, seed=13):
+    rng = random.Random(seed)
+    data = [[None] * 9, [None] * 9, [None, "Dimension"] + [None] * 7]
+    areas = 0
+    while len(data) < rows:
+        row = [None] * 9
+        if rng.random() < 0.02 or areas == 0:
+            areas += 1
+            row[0] = f"Area {areas}"
+            row[8] = rng.choice([3, 4, 5, 4.0, "4", None, "n/a", 0])
+            row[1] = f"Dimension {len(data)}" if rng.random() > 0.2 else None
+        else:
+            row[1] = rng.choice([f"Dimension {len(data)}", f"Dimension {len(data)}", "Dimension", None, np.nan])
+        data.append(row)
+    return pd.DataFrame(data[:rows], dtype=object)
+
+
+def best_of(repeat, fn, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    checksheet = synthetic_checksheet(args.rows)
+    reports = synthetic_reports(args.rows)
+    cases = [
+        ("CheckSheet", checksheet, legacy_parse_checksheet,
+         lambda df: maturity_level_records(parse_checksheet_frame(df))),
+        ("Reports", reports, legacy_parse_reports, lambda df: report_areas(parse_report_frame(df))),
+    ]
+    print(f"{args.rows:,} rows per sheet, best of {args.repeat}\n")
+    for label, df, legacy, vectorized in cases:
+        legacy_seconds, expected = best_of(args.repeat, legacy, df)
+        vector_seconds, actual = best_of(args.repeat, vectorized, df)
+        assert actual == expected, f"{label}: vectorized output differs from the iterrows loop"
+        print(f"{label:10} {len(expected):7,} records  iterrows {legacy_seconds * 1000:9.1f} ms  "
+              f"vectorized {vector_seconds * 1000:8.1f} ms  ({legacy_seconds / vector_seconds:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
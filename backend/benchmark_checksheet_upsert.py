@@ -0,0 +1,115 @@
+"""
+Benchmark: per-row loop vs set-based bulk upsert for POST /api/mm/checksheet-selections
+Saves 10k selections across 50 assessments into a scratch SQLite database, then re-saves
+the same payload with a quarter of the rows toggled (mix of updates and unchanged rows).
+
+Usage:
+    python benchmark_checksheet_upsert.py [--assessments 50] [--criteria 200]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, Assessment, MaturityLevel, ChecksheetSelection
+from main import ChecksheetSelectionCreate, save_checksheet_selections
+
+
+def build_database(path, assessments, criteria):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = Session()
+    db.add_all(
+        MaturityLevel(level=(i % 5) + 1, name=f"Criterion {i}", sub_level=f"{(i % 5) + 1}.{i}a",
+                      description=f"Synthetic criterion {i}")
+        for i in range(criteria)
+    )
+    db.add_all(Assessment(plant_name="Bench Plant", shop_unit="Press Shop") for _ in range(assessments))
+    db.commit()
+    level_ids = [row.id for row in db.query(MaturityLevel.id).all()]
+    assessment_ids = [row.id for row in db.query(Assessment.id).all()]
+    db.close()
+    return engine, Session, assessment_ids, level_ids
+
+
+def build_payload(assessment_ids, level_ids, seed):
+    rng = random.Random(seed)
+    return [
+        ChecksheetSelectionCreate(
+            assessment_id=assessment_id,
+            maturity_level_id=level_id,
+            is_selected=rng.random() < 0.5,
+            evidence=None
+        )
+        for assessment_id in assessment_ids
+        for level_id in level_ids
+    ]
+
+
+def toggle(payload, fraction, seed):
+    rng = random.Random(seed)
+    return [
+        ChecksheetSelectionCreate(
+            assessment_id=row.assessment_id,
+            maturity_level_id=row.maturity_level_id,
+            is_selected=(not row.is_selected) if rng.random() < fraction else row.is_selected,
+            evidence=row.evidence
+        )
+        for row in payload
+    ]
+
+
+def run(mode, assessments, criteria):
+    bulk = mode == "bulk"
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, Session, assessment_ids, level_ids = build_database(
+            os.path.join(tmp, "bench.db"), assessments, criteria
+        )
+        first = build_payload(assessment_ids, level_ids, seed=1)
+        second = toggle(first, 0.25, seed=2)
+
+        timings = []
+        for payload in (first, second):
+            db = Session()
+            start = time.perf_counter()
+            result = save_checksheet_selections(payload, bulk=bulk, db=db)
+            timings.append(time.perf_counter() - start)
+            db.close()
+
+        db = Session()
+        stored = db.query(ChecksheetSelection).count()
+        db.close()
+        engine.dispose()
+    return timings, stored, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assessments", type=int, default=50)
+    parser.add_argument("--criteria", type=int, default=200)
+    args = parser.parse_args()
+
+    total = args.assessments * args.criteria
+    print(f"Saving {total} selections across {args.assessments} assessments\n")
+
+    results = {}
+    for mode in ("loop", "bulk"):
+        timings, stored, result = run(mode, args.assessments, args.criteria)
+        results[mode] = timings
+        print(f"{mode:>5}: first save {timings[0]:.3f}s ({total / timings[0]:,.0f} rows/s), "
+              f"re-save {timings[1]:.3f}s ({total / timings[1]:,.0f} rows/s), {stored} rows stored")
+        if mode == "bulk":
+            print(f"       re-save outcomes: {result['inserted']} inserted, "
+                  f"{result['updated']} updated, {result['unchanged']} unchanged")
+
+    print(f"\nSpeed-up: first save {results['loop'][0] / results['bulk'][0]:.1f}x, "
+          f"re-save {results['loop'][1] / results['bulk'][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Micro-benchmark for the per-dimension scoring engine (scoring.py)
+Builds a synthetic checksheet of 50k criteria spread over many dimensions, selects a random
+share of them for one assessment and times:
+  - compute_dimension_levels on pre-aggregated groups (pure in-memory pass)
+  - score_assessment end to end against SQLite, as a dry run and as a write
+
+Usage:
+    python benchmark_scoring.py [--criteria 50000] [--dimensions 200] [--selected 0.6]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, Area, Assessment, ChecksheetSelection, Dimension, MaturityLevel
+from scoring import compute_dimension_levels, criteria_totals, score_assessment, selected_counts
+
+
+def build_database(path, criteria, dimensions, selected_share, seed=7):
+    rng = random.Random(seed)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = Session()
+
+    area = Area(name="Bench Area", desired_level=4)
+    db.add(area)
+    db.flush()
+    db.execute(insert(Dimension), [
+        {"name": f"Dimension {i}", "area_id": area.id, "current_level": 1, "desired_level": 4}
+        for i in range(dimensions)
+    ])
+    dimension_ids = [row.id for row in db.query(Dimension.id).order_by(Dimension.id).all()]
+
+    # Half the criteria link by dimension_id, half by category name
+    rows = []
+    for i in range(criteria):
+        dimension_index = i % dimensions
+        level = (i // dimensions) % 5 + 1
+        linked = i % 2 == 0
+        rows.append({
+            "dimension_id": dimension_ids[dimension_index] if linked else None,
+            "level": level,
+            "name": f"Criterion {i}",
+            "sub_level": f"{level}.{i % 9 + 1}{'abcdef'[i % 6]}",
+            "category": None if linked else f"Dimension {dimension_index}",
+            "description": f"Synthetic criterion {i}"
+        })
+    db.execute(insert(MaturityLevel), rows)
+
+    assessment = Assessment(area_id=area.id, plant_name="Bench Plant", shop_unit="Press Shop")
+    db.add(assessment)
+    db.flush()
+    level_ids = [row.id for row in db.query(MaturityLevel.id).all()]
+    db.execute(insert(ChecksheetSelection), [
+        {"assessment_id": assessment.id, "maturity_level_id": level_id, "is_selected": True}
+        for level_id in level_ids
+        if rng.random() < selected_share
+    ])
+    db.commit()
+    assessment_id = assessment.id
+    db.close()
+    return engine, Session, assessment_id
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--criteria", type=int, default=50000)
+    parser.add_argument("--dimensions", type=int, default=200)
+    parser.add_argument("--selected", type=float, default=0.6)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, Session, assessment_id = build_database(
+            os.path.join(tmp, "bench.db"), args.criteria, args.dimensions, args.selected
+        )
+        db = Session()
+        assessment = db.get(Assessment, assessment_id)
+        dimensions = [(row.id, row.name) for row in db.query(Dimension.id, Dimension.name).all()]
+
+        totals = criteria_totals(db)
+        selected = [row[1:] for row in selected_counts(db, [assessment_id])]
+        print(f"{args.criteria} criteria, {len(dimensions)} dimensions, "
+              f"{sum(row[3] for row in selected)} selected, {len(totals)} aggregated groups\n")
+
+        compute_time, scores = timed(lambda: compute_dimension_levels(totals, selected, dimensions, 0.5), args.repeat)
+        print(f"compute_dimension_levels:        {compute_time * 1000:8.2f} ms ({len(scores)} dimensions scored)")
+
+        query_time, _ = timed(lambda: (criteria_totals(db), selected_counts(db, [assessment_id])), args.repeat)
+        print(f"aggregation queries:             {query_time * 1000:8.2f} ms")
+
+        dry_time, _ = timed(lambda: score_assessment(db, assessment, dry_run=True, threshold=0.5), args.repeat)
+        print(f"score_assessment (dry run):      {dry_time * 1000:8.2f} ms")
+
+        start = time.perf_counter()
+        first = score_assessment(db, assessment, threshold=0.5)
+        db.commit()
+        first_time = time.perf_counter() - start
+        print(f"score_assessment (first write):  {first_time * 1000:8.2f} ms ({first['dimensions_updated']} rows written)")
+
+        start = time.perf_counter()
+        again = score_assessment(db, assessment, threshold=0.5)
+        db.commit()
+        again_time = time.perf_counter() - start
+        print(f"score_assessment (no changes):   {again_time * 1000:8.2f} ms ({again['dimensions_updated']} rows written)")
+
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Concurrency benchmark: default SQLite engine vs the tuned engine from database.create_db_engine
+Runs a mixed read/write workload through the endpoint functions from a thread pool the size of
+Starlette's (40 threads) against two copies of the same database:
+  - reads: GET /api/mm/reports/summary, /api/mm/maturity-levels, /api/mm/checksheet-selections/{id}
+  - writes: POST /api/mm/checksheet-selections (bulk) and PUT /api/mm/dimensions/{id}
+
+Usage:
+    python benchmark_sqlite_tuning.py [--source manufacturing.db] [--requests 4000] [--write-share 0.2]
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from fastapi import HTTPException
+
+from database import Assessment, Dimension, MaturityLevel, create_db_engine, init_db
+from main import (
+    ChecksheetSelectionCreate, DimensionUpdate,
+    get_checksheet_selections, get_maturity_levels, get_reports_summary,
+    save_checksheet_selections, update_dimension,
+)
+
+
+def workload(Session, requests, write_share, threads, seed=11):
+    db = Session()
+    assessment_ids = [row.id for row in db.query(Assessment.id).all()]
+    level_ids = [row.id for row in db.query(MaturityLevel.id).all()]
+    dimension_ids = [row.id for row in db.query(Dimension.id).all()]
+    db.close()
+
+    rng = random.Random(seed)
+    plan = [rng.random() < write_share for _ in range(requests)]
+    lock = threading.Lock()
+    errors = []
+
+    def one(is_write):
+        local = random.Random()
+        db = Session()
+        try:
+            if is_write:
+                if local.random() < 0.5:
+                    assessment_id = local.choice(assessment_ids)
+                    payload = [
+                        ChecksheetSelectionCreate(
+                            assessment_id=assessment_id, maturity_level_id=level_id,
+                            is_selected=local.random() < 0.5
+                        )
+                        for level_id in level_ids
+                    ]
+                    save_checksheet_selections(payload, bulk=True, db=db)
+                else:
+                    update_dimension(
+                        local.choice(dimension_ids), DimensionUpdate(current_level=local.randint(1, 5)), db=db
+                    )
+            else:
+                choice = local.random()
+                if choice < 0.4:
+                    get_reports_summary(db=db)
+                elif choice < 0.7:
+                    get_maturity_levels(db=db)
+                else:
+                    get_checksheet_selections(local.choice(assessment_ids), db=db)
+        except (OperationalError, HTTPException) as e:
+            with lock:
+                errors.append(str(e)[:120])
+        finally:
+            db.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(one, plan))
+    elapsed = time.perf_counter() - start
+    return elapsed, errors
+
+
+def run(label, source, make_engine, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        shutil.copyfile(source, path)
+        engine = make_engine(f"sqlite:///{path}")
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        elapsed, errors = workload(Session, args.requests, args.write_share, args.threads)
+        engine.dispose()
+    print(f"{label:>8}: {args.requests / elapsed:8.1f} req/s ({elapsed:.2f}s, {len(errors)} failed requests)")
+    if errors:
+        print(f"          first error: {errors[0]}")
+    return args.requests / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default="manufacturing.db", help="seeded database to copy for each run")
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--write-share", type=float, default=0.2)
+    parser.add_argument("--threads", type=int, default=40)
+    args = parser.parse_args()
+
+    # Bring the source schema up to date once so both copies start identical
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "source.db")
+        shutil.copyfile(args.source, source)
+        upgrade = create_engine(f"sqlite:///{source}")
+        init_db(upgrade)
+        upgrade.dispose()
+
+        print(f"{args.requests} requests, {args.write_share:.0%} writes, {args.threads} threads\n")
+        baseline = run(
+            "default", source,
+            lambda url: create_engine(url, connect_args={"check_same_thread": False}),
+            args
+        )
+        tuned = run("tuned", source, lambda url: create_db_engine(url), args)
+        print(f"\nThroughput change: {tuned / baseline:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
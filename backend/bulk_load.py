@@ -0,0 +1,161 @@
+"""
+Bulk-load layer for the seed and refresh loaders
+BulkLoader writes rows with one executemany-style INSERT per table (session.execute(insert(Model),
+rows)) instead of adding ORM objects one at a time, fetching generated ids with RETURNING when
+child rows need them, and records rows/second per table (and, for table_sync.sync_table, the
+inserted/updated/deleted/unchanged counts). Core inserts skip ORM events, so row
+values those events would set (RatingScale.normalized_name) are filled in here.
+bulk_session() gives a standalone loader its own connection, with the PRAGMAs tuned for one
+large write transaction (MM_BULK_LOAD_SYNCHRONOUS, MM_BULK_LOAD_CACHE_SIZE) and restored
+afterwards; loaders handed a caller's session only use the BulkLoader.
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.orm import Session
+
+from database import RatingScale, engine
+from naming import normalize_dimension_name
+
+# synchronous can only change outside a transaction, hence the dedicated connection
+BULK_LOAD_PRAGMAS = {
+    "synchronous": os.environ.get("MM_BULK_LOAD_SYNCHRONOUS", "OFF"),
+    "cache_size": os.environ.get("MM_BULK_LOAD_CACHE_SIZE", "-262144"),  # 256 MB
+}
+
+
+def _rating_scale_row(row: dict) -> dict:
+    return {**row, "normalized_name": normalize_dimension_name(row["dimension_name"])}
+
+
+# Values that ORM events set on save, applied to plain row dicts instead
+ROW_PREPARERS = {
+    RatingScale: _rating_scale_row,
+}
+
+
+def begin_write(db: Session):
+    """
+    Start the session's SQLite transaction with BEGIN IMMEDIATE, taking the write lock up front,
+    so reads made for a write (table_sync's diff) and the write itself see one snapshot. By
+    default SQLite only takes the lock at the first write, and the reads before it run outside
+    the transaction. No-op when a transaction is already open on the connection.
+    """
+    conn = db.connection()
+    if not conn.connection.dbapi_connection.in_transaction:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def prepare_rows(model, rows: Iterable[dict]) -> List[dict]:
+    prepare = ROW_PREPARERS.get(model)
+    return [prepare(row) for row in rows] if prepare else list(rows)
+
+
+class BulkLoader:
+    def __init__(self, db: Session):
+        self.db = db
+        self.tables: Dict[str, Dict] = {}
+        self.changes: Dict[str, Dict] = {}  # per table, from table_sync.sync_table
+
+    def _record(self, model, rows: int, seconds: float):
+        stats = self.tables.setdefault(model.__tablename__, {"rows": 0, "seconds": 0.0})
+        stats["rows"] += rows
+        stats["seconds"] += seconds
+
+    def record_sync(self, model, result):
+        changes = self.changes.setdefault(model.__tablename__, dict.fromkeys(result.counts(), 0))
+        for name, count in result.counts().items():
+            changes[name] += count
+
+    def insert(self, model, rows: Iterable[dict], return_ids: bool = False) -> Optional[List[int]]:
+        """Insert rows in one statement; with return_ids, the new ids in row order"""
+        rows = prepare_rows(model, rows)
+        if not rows:
+            return [] if return_ids else None
+        start = time.perf_counter()
+        if return_ids:
+            ids = list(self.db.scalars(insert(model).returning(model.id, sort_by_parameter_order=True), rows))
+        else:
+            ids = None
+            self.db.execute(insert(model), rows)
+        self._record(model, len(rows), time.perf_counter() - start)
+        return ids
+
+    def update(self, model, rows: Iterable[dict]):
+        """Update rows by primary key ("id" in every row) with one executemany UPDATE"""
+        rows = prepare_rows(model, rows)
+        if not rows:
+            return
+        start = time.perf_counter()
+        self.db.execute(update(model), rows)
+        self._record(model, len(rows), time.perf_counter() - start)
+
+    def delete_ids(self, model, ids: Iterable[int]):
+        ids = list(ids)
+        if not ids:
+            return
+        start = time.perf_counter()
+        self.db.execute(delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False))
+        self._record(model, len(ids), time.perf_counter() - start)
+
+    @property
+    def rows(self) -> int:
+        return sum(stats["rows"] for stats in self.tables.values())
+
+    def report(self) -> Dict:
+        """Rows, seconds and rows/second per table and overall"""
+        def rate(rows, seconds):
+            return round(rows / seconds) if seconds else None
+
+        seconds = sum(stats["seconds"] for stats in self.tables.values())
+        return {
+            "tables": {
+                table: {"rows": stats["rows"], "seconds": round(stats["seconds"], 4),
+                        "rows_per_second": rate(stats["rows"], stats["seconds"])}
+                for table, stats in self.tables.items()
+            },
+            "rows": self.rows,
+            "seconds": round(seconds, 4),
+            "rows_per_second": rate(self.rows, seconds),
+            "changes": self.changes,
+        }
+
+    def summary(self) -> str:
+        report = self.report()
+        tables = ", ".join(f"{table} {stats['rows']}" for table, stats in report["tables"].items())
+        summary = (f"Bulk loaded {report['rows']} rows ({tables}) in {report['seconds']:.3f}s"
+                   f" - {report['rows_per_second'] or 0:,} rows/s")
+        if self.changes:
+            summary += "; " + ", ".join(
+                f"{table} +{counts['inserted']} ~{counts['updated']} -{counts['deleted']} ={counts['unchanged']}"
+                for table, counts in self.changes.items()
+            )
+        return summary
+
+
+@contextmanager
+def bulk_session(db_engine=None):
+    """
+    A session on a dedicated connection tuned for one bulk-load transaction. Yields
+    (session, BulkLoader); commits on success, rolls back on error, then restores the PRAGMAs.
+    """
+    with (db_engine or engine).connect() as conn:
+        previous = {pragma: conn.exec_driver_sql(f"PRAGMA {pragma}").scalar() for pragma in BULK_LOAD_PRAGMAS}
+        for pragma, value in BULK_LOAD_PRAGMAS.items():
+            conn.exec_driver_sql(f"PRAGMA {pragma}={value}")
+        conn.commit()
+        db = Session(bind=conn, autoflush=False)
+        try:
+            yield db, BulkLoader(db)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+            for pragma, value in previous.items():
+                conn.exec_driver_sql(f"PRAGMA {pragma}={value}")
+            conn.commit()
@@ -0,0 +1,62 @@
+"""
+Consistency check for the materialized area_summary table
+Recomputes every area's summary from scratch (straight from the dimensions, without the
+maintenance code in area_summary.py) and compares it with the stored rows. Exits 1 on any
+difference; --repair rebuilds the table afterwards.
+
+Usage:
+    python check_area_summary.py [--source manufacturing.db] [--repair]
+"""
+import argparse
+import sys
+
+from sqlalchemy.orm import selectinload, sessionmaker
+
+from area_summary import refresh_area_summaries, summary_response
+from database import Area, AreaSummary, create_db_engine, init_db
+from reports import summarize_area
+
+
+def find_mismatches(db):
+    expected = {
+        area.id: summarize_area(area, area.dimensions)
+        for area in db.query(Area).options(selectinload(Area.dimensions)).all()
+    }
+    stored = {row.area_id: summary_response(row) for row in db.query(AreaSummary).all()}
+    return [
+        (area_id, expected.get(area_id), stored.get(area_id))
+        for area_id in sorted(set(expected) | set(stored))
+        if expected.get(area_id) != stored.get(area_id)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default="manufacturing.db")
+    parser.add_argument("--repair", action="store_true", help="rebuild the table when it is out of step")
+    args = parser.parse_args()
+
+    engine = create_db_engine(f"sqlite:///{args.source}")
+    init_db(engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        mismatches = find_mismatches(db)
+        for area_id, expected, stored in mismatches:
+            print(f"area {area_id}:\n  expected {expected}\n  stored   {stored}")
+        print(f"{len(mismatches)} area(s) out of step")
+
+        if mismatches and args.repair:
+            rebuilt = refresh_area_summaries(db)
+            db.commit()
+            remaining = find_mismatches(db)
+            print(f"Rebuilt {rebuilt} summary rows, {len(remaining)} area(s) still out of step")
+            mismatches = remaining
+    finally:
+        db.close()
+        engine.dispose()
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
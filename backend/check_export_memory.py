@@ -0,0 +1,97 @@
+"""
+Memory check for the streaming checksheet-selection export
+Fills two scratch databases, one with 1k selections and one with --rows selections (1M by
+default), consumes the full export from each in every format under tracemalloc and fails
+(exit code 1) when the peak for the large table is not flat - i.e. more than --tolerance
+above the small one. The body is consumed chunk by chunk, as the HTTP server would send it.
+
+Usage:
+    python check_export_memory.py [--rows 1000000] [--tolerance-mib 2]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from database import Assessment, ChecksheetSelection, MaturityLevel, create_db_engine, init_db
+from exports import FORMATS, build_export_query, stream_selections
+
+CRITERIA = 1000
+
+
+def build_database(path, rows):
+    engine = create_db_engine(f"sqlite:///{path}")
+    init_db(engine)
+    assessments = max(1, -(-rows // CRITERIA))
+    with engine.begin() as conn:
+        conn.execute(insert(MaturityLevel), [
+            {"level": i % 5 + 1, "name": f"Criterion {i}", "sub_level": f"{i % 5 + 1}.{i}a",
+             "category": "Export Check", "description": f"Criterion {i}"}
+            for i in range(CRITERIA)
+        ])
+        conn.execute(insert(Assessment), [
+            {"plant_name": "Export Plant", "shop_unit": "Press Shop", "assessor_name": "Checker"}
+            for _ in range(assessments)
+        ])
+        batch = []
+        for i in range(rows):
+            batch.append({
+                "assessment_id": i // CRITERIA + 1, "maturity_level_id": i % CRITERIA + 1,
+                "is_selected": i % 3 == 0, "evidence": "Verified on the line" if i % 7 == 0 else None
+            })
+            if len(batch) == 50000:
+                conn.execute(insert(ChecksheetSelection), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(ChecksheetSelection), batch)
+    return engine
+
+
+def measure(Session, fmt):
+    query = build_export_query(["maturity_level", "assessment"], plant_name="Export Plant")
+    tracemalloc.start()
+    start = time.perf_counter()
+    total = 0
+    for chunk in stream_selections(query, fmt, session_factory=Session):
+        total += len(chunk)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, total, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--tolerance-mib", type=float, default=2.0)
+    args = parser.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for rows in (1000, args.rows):
+            engine = build_database(os.path.join(tmp, f"export_{rows}.db"), rows)
+            Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+            for fmt in FORMATS:
+                peak, total, elapsed = measure(Session, fmt)
+                results[(rows, fmt)] = peak
+                print(f"{rows:>10,} rows {fmt:6} peak {peak / 2**20:7.2f} MiB, "
+                      f"{total / 2**20:9.1f} MiB streamed in {elapsed:6.2f}s")
+            engine.dispose()
+
+        for fmt in FORMATS:
+            growth = (results[(args.rows, fmt)] - results[(1000, fmt)]) / 2**20
+            ok = growth <= args.tolerance_mib
+            failures += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {fmt}: peak grew {growth:+.2f} MiB (tolerance {args.tolerance_mib} MiB)")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Import-time budget for backend startup
+Cold-imports main in fresh interpreters (best of --runs, each timed around the import itself)
+and fails (exit code 1) when it takes longer than --budget-ms, or when the import pulls in a
+module that only a refresh, seed or export should load: pandas, numpy, openpyxl, weasyprint,
+the workbook loaders and the legacy portfolio code. On failure the -X importtime digest from
+importtime_report.py shows where the time went.
+
+Usage:
+    python check_import_budget.py [--module main] [--budget-ms 700] [--runs 5]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+from importtime_report import BACKEND_DIR, digest, format_digest, import_env
+
+# Loaded on demand only; none of them may come in with `import main`
+DEFERRED_MODULES = [
+    "pandas", "numpy", "openpyxl", "weasyprint",
+    "refresh_orchestrator", "workbook_cache", "checksheet_parser", "bulk_load", "table_sync",
+    "seed_data", "load_checksheet_data", "load_rating_scales_data", "load_reports_data",
+    "load_simulated_data", "load_dimension_checksheet_data", "update_rating_scales",
+    "add_asset_connectivity_oee", "snapshot", "legacy_portfolio",
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "modules": sorted(sys.modules)}}))
+"""
+
+
+def cold_import(module: str):
+    """(milliseconds, loaded module names) for one import of `module` in a fresh interpreter"""
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module)],
+        cwd=BACKEND_DIR, env=import_env(), capture_output=True, text=True, check=True
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    return result["ms"], set(result["modules"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--budget-ms", type=float, default=700.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    timings, loaded = [], set()
+    for _ in range(args.runs):
+        ms, modules = cold_import(args.module)
+        timings.append(ms)
+        loaded |= modules
+    best = min(timings)
+    deferred = [name for name in DEFERRED_MODULES if name in loaded]
+
+    print(f"import {args.module}: best {best:.0f} ms, median {sorted(timings)[len(timings) // 2]:.0f} ms "
+          f"over {args.runs} cold runs (budget {args.budget_ms:.0f} ms)")
+    if deferred:
+        print(f"  imported eagerly: {', '.join(deferred)}")
+    failed = best > args.budget_ms or bool(deferred)
+    if failed:
+        print(format_digest(digest(args.module)))
+    print("FAIL" if failed else "ok")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
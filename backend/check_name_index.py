@@ -0,0 +1,58 @@
+"""
+Result check for the rating-scale name index (name_index.py)
+The index must return at least every name the old LIKE '%query%' lookup did, with better
+matches first. Checks a fixed case where a query has both a name-prefix match and an
+infix-only match, then every token and inner fragment of the names in the database. Exits 1
+when a substring match is missing or ranked above a prefix match.
+
+Usage:
+    python check_name_index.py [--source manufacturing.db]
+"""
+import argparse
+import sys
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from database import RatingScale, create_db_engine, init_db
+from name_index import NameIndex
+
+
+def problems(index: NameIndex, query: str):
+    found = index.search(query)
+    missing = [name for name in index.names if query in name and name not in found]
+    return [f"{query!r}: LIKE match {name!r} missing" for name in missing]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default="manufacturing.db")
+    args = parser.parse_args()
+
+    failures = []
+    # "net": prefix of "network monitoring", inside "cabinet layout" only
+    index = NameIndex(["network monitoring", "cabinet layout", "quality"])
+    found = index.search("net")
+    if found != ["network monitoring", "cabinet layout"]:
+        failures.append(f"'net': expected the prefix match, then the infix match; got {found}")
+
+    engine = create_db_engine(f"sqlite:///{args.source}")
+    init_db(engine)
+    with sessionmaker(bind=engine)() as db:
+        index = NameIndex(db.execute(select(RatingScale.normalized_name).distinct()).scalars())
+    engine.dispose()
+    queries = {token for name in index.names for token in name.split()}
+    queries |= {name[i:i + 4] for name in index.names for i in range(1, len(name) - 4, 3)}
+    queries = sorted(query for query in queries if query.strip())
+    for query in queries:
+        failures += problems(index, query)
+
+    print(f"{len(queries) + 1} queries over {len(index.names)} names: {len(failures)} problem(s)")
+    for failure in failures[:10]:
+        print(f"  {failure}")
+    print("FAIL" if failures else "ok")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Query budget regression check for the area/report endpoints
+Runs each endpoint against a scratch copy of the database and fails (exit code 1) when it
+executes more SQL statements than its budget - e.g. when a relationship goes back to lazy
+loading and the count starts growing with the number of areas.
+
+Usage:
+    python check_query_budget.py [--source manufacturing.db]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from area_summary import refresh_area_summaries
+from database import Area, Dimension, create_db_engine, get_db, init_db
+from main import app
+from query_counter import count_queries
+
+# Statements per request: areas + their dimensions (selectinload); the summary is one read of area_summary
+QUERY_BUDGETS = {
+    ("GET", "/api/mm/areas"): 2,
+    ("GET", "/api/mm/areas/{area_id}"): 2,
+    ("GET", "/api/mm/reports/summary"): 1,
+    ("POST", "/api/mm/generate-report"): 2,
+}
+
+
+def add_areas(Session, count):
+    """Grow the area count so a per-area lazy load would blow the budget"""
+    db = Session()
+    for i in range(count):
+        area = Area(name=f"Budget Check Area {i}", desired_level=3)
+        db.add(area)
+        db.flush()
+        db.add_all(Dimension(name=f"Dimension {j}", area_id=area.id, current_level=2, desired_level=3) for j in range(3))
+    refresh_area_summaries(db)
+    db.commit()
+    area_id = db.query(Area.id).first()[0]
+    db.close()
+    return area_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default="manufacturing.db")
+    args = parser.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "budget.db")
+        shutil.copyfile(args.source, path)
+        engine = create_db_engine(f"sqlite:///{path}")
+        init_db(engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        area_id = add_areas(Session, 10)
+
+        def override_get_db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        client = TestClient(app)
+        try:
+            for (method, route), budget in QUERY_BUDGETS.items():
+                with count_queries(engine) as counter:
+                    response = client.request(method, route.format(area_id=area_id))
+                ok = response.status_code == 200 and counter.count <= budget
+                failures += not ok
+                print(f"{'ok  ' if ok else 'FAIL'} {method:4} {route:30} {counter.count} queries "
+                      f"(budget {budget}, status {response.status_code})")
+                if not ok:
+                    for statement in counter.statements:
+                        print(f"       {' '.join(statement.split())[:140]}")
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            engine.dispose()
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
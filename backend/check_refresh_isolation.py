@@ -0,0 +1,134 @@
+"""
+Isolation check for catalog reloads: readers never see an emptied or half-written catalog
+On a scratch copy of the database, a writer thread keeps syncing the maturity-level and
+rating-scale catalogs back and forth between the bundled CheckSheet workbook and a variant of
+it (rows dropped, edited and added), one transaction per reload, exactly as the loaders do.
+Reader threads meanwhile fingerprint both tables (row count and text length) on their own
+connections. Fails (exit code 1) when a reader sees anything but one complete catalog or the
+other, or when reads stall behind the writer.
+
+Usage:
+    python check_refresh_isolation.py [--source manufacturing.db] [--seconds 5] [--readers 4]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from database import MaturityLevel, RatingScale, create_db_engine, init_db
+from load_checksheet_data import parse_checksheet
+from load_rating_scales_data import find_checksheet_workbook, parse_rating_scales
+from table_sync import sync_table
+
+FINGERPRINT = text(
+    "SELECT (SELECT count(*) FROM maturity_levels), (SELECT total(length(description)) FROM maturity_levels),"
+    " (SELECT count(*) FROM rating_scales), (SELECT total(length(digital_maturity_description)) FROM rating_scales)"
+)
+
+
+def variant(records, text_column):
+    """Every 7th row dropped, every 5th edited, three new rows"""
+    changed = [dict(record) for i, record in enumerate(records) if i % 7]
+    for record in changed[::5]:
+        record[text_column] = f"{record[text_column]} (revised)"
+    extra = [dict(records[-1], level=9, **{text_column: f"Added {i}"}) for i in range(3)]
+    return changed + extra
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default="manufacturing.db")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--max-read-ms", type=float, default=250.0, help="slowest read allowed")
+    args = parser.parse_args()
+
+    workbook = find_checksheet_workbook()
+    if not workbook:
+        print("CheckSheetData.xlsx not found")
+        sys.exit(1)
+    maturity, ratings = parse_checksheet(workbook), parse_rating_scales(workbook)
+    catalogs = {
+        "a": (maturity, ratings),
+        "b": (variant(maturity, "description"), variant(ratings, "digital_maturity_description")),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "isolation.db")
+        shutil.copyfile(args.source, path)
+        engine = create_db_engine(f"sqlite:///{path}")
+        init_db(engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        def load(name):
+            db = Session()
+            try:
+                maturity, ratings = catalogs[name]
+                sync_table(db, MaturityLevel, maturity)
+                sync_table(db, RatingScale, ratings)
+                db.commit()
+            finally:
+                db.close()
+
+        def fingerprint():
+            with engine.connect() as conn:
+                return tuple(conn.execute(FINGERPRINT).one())
+
+        expected = {}
+        for name in ("b", "a"):
+            load(name)
+            expected[fingerprint()] = name
+
+        stop = threading.Event()
+        reloads, write_seconds = [0], []
+        seen, unexpected, read_seconds = {}, [], []
+        lock = threading.Lock()
+
+        def writer():
+            names = ["b", "a"]
+            while not stop.is_set():
+                start = time.perf_counter()
+                load(names[reloads[0] % 2])
+                write_seconds.append(time.perf_counter() - start)
+                reloads[0] += 1
+
+        def reader():
+            while not stop.is_set():
+                start = time.perf_counter()
+                state = fingerprint()
+                elapsed = time.perf_counter() - start
+                with lock:
+                    read_seconds.append(elapsed)
+                    if state in expected:
+                        seen[expected[state]] = seen.get(expected[state], 0) + 1
+                    else:
+                        unexpected.append(state)
+
+        threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(args.readers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+    slowest_read = max(read_seconds) * 1000
+    print(f"{reloads[0]} reloads (mean {sum(write_seconds) / len(write_seconds) * 1000:.1f} ms), "
+          f"{len(read_seconds)} reads: {seen.get('a', 0)} workbook catalog, {seen.get('b', 0)} variant, "
+          f"{len(unexpected)} partial; slowest read {slowest_read:.1f} ms")
+    for state in unexpected[:5]:
+        print(f"  partial state: {state}")
+    failed = bool(unexpected) or slowest_read > args.max_read_ms or not reloads[0]
+    print("FAIL" if failed else "ok")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
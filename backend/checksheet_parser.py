@@ -0,0 +1,155 @@
+"""
+Vectorized parsers for the CheckSheet and Reports sheets
+Whole-column pandas operations instead of a Python loop per row: masks pick out skipped and
+header rows, str.extract pulls out level and sub-level codes, and ffill carries the current
+level/category (or area) down to the rows below it. The output matches the row-by-row
+loaders these replace - see benchmark_checksheet_parser.py, which checks that on a
+synthetic sheet and times both.
+"""
+import numpy as np
+import pandas as pd
+
+MATURITY_LEVEL_COLUMNS = ["level", "name", "sub_level", "category", "description"]
+REPORT_COLUMNS = ["area_index", "area", "desired_level", "dimension"]
+
+# Criterion names are truncated, descriptions kept whole
+MAX_NAME_LENGTH = 100
+
+CATEGORY_CODE = r"^[+-]?\d+\.[+-]?\d+$"  # 1.1
+CRITERION_CODE = r"^([+-]?\d+)\.[^.]*?[a-z]*$"  # 1.1a -> 1
+HAS_LETTER = r"[^\W\d_]"
+
+
+def cell_text(column: pd.Series) -> pd.Series:
+    """str(value).strip() per cell, "" for empty cells"""
+    return column.astype(str).str.strip().where(column.notna(), "")
+
+
+def _cell_str(column: pd.Series) -> pd.Series:
+    """str(value) per cell without stripping, "" for empty cells"""
+    return column.astype(str).where(column.notna(), "")
+
+
+def _column(df: pd.DataFrame, index: int) -> pd.Series:
+    return df[index] if index in df.columns else pd.Series(np.nan, index=df.index, dtype=object)
+
+
+def parse_checksheet_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    CheckSheet tab (read with header=None) -> one MaturityLevel row per level header
+    ("Level N: name" in column 1), category (1.1) and criterion (1.1a), in sheet order.
+    A criterion belongs to the category above it; headers take the level in their text,
+    or the previous header's level when the text has none.
+    """
+    col0, col1, col2 = (cell_text(_column(df, i)) for i in range(3))
+
+    skipped = (
+        ((col0 == "") & (col1 == ""))
+        | col0.str.contains("Check Sheet for Smart Factory", regex=False)
+        | col0.str.contains("Plant:", regex=False)
+        | col0.str.contains("Date:", regex=False)
+        | (col1 == "Remarks")
+        | (col2 == "Press Shop")
+    )
+    header = ~skipped & col1.str.contains("Level", regex=False) & col1.str.contains(":", regex=False)
+    rest = ~skipped & ~header
+    category = rest & col0.str.match(CATEGORY_CODE)
+    criterion_level = col0.str.extract(CRITERION_CODE, expand=False)
+    criterion = (
+        rest & col0.str.contains(HAS_LETTER) & criterion_level.notna() & (col1 != "")
+    )
+
+    # First "Level N" (N = 1..5) mentioned by a header, carried from the previous header otherwise
+    header_text = col1[header]
+    header_level = pd.Series(
+        np.select([header_text.str.contains(f"Level {n}", regex=False) for n in range(1, 6)],
+                  [1, 2, 3, 4, 5], default=0),
+        index=header_text.index,
+    ).replace(0, np.nan).ffill()
+    header_name = header_text.str.split(":", n=1).str[1].str.strip()
+    header_level_text = header_level.astype("Int64").astype("string").fillna("None")
+
+    # Category in force at each row: the text of the latest category row above it
+    current_category = col1.where(category).ffill()
+
+    records = pd.concat([
+        pd.DataFrame({
+            "level": header_level,
+            "name": header_name,
+            "sub_level": None,
+            "category": None,
+            "description": "Level " + header_level_text + ": " + header_name,
+        }),
+        pd.DataFrame({
+            "level": col0[category].str.split(".", n=1).str[0].astype(int),
+            "name": col1[category],
+            "sub_level": col0[category],
+            "category": col1[category],
+            "description": col1[category],
+        })[col1[category] != ""],
+        pd.DataFrame({
+            "level": criterion_level[criterion].astype(int),
+            "name": col1[criterion].str[:MAX_NAME_LENGTH],
+            "sub_level": col0[criterion],
+            "category": current_category[criterion],
+            "description": col1[criterion],
+        }),
+    ]).sort_index(kind="stable")
+    records["level"] = records["level"].astype("Int64")
+    return records[MATURITY_LEVEL_COLUMNS].astype(object).where(records.notna(), None).reset_index(drop=True)
+
+
+def maturity_level_records(frame: pd.DataFrame):
+    """parse_checksheet_frame output as a list of MaturityLevel column dicts"""
+    return [dict(zip(MATURITY_LEVEL_COLUMNS, row)) for row in frame.itertuples(index=False, name=None)]
+
+
+def _desired_level(value) -> int:
+    if value and str(value) != "nan":
+        try:
+            return int(float(value))
+        except Exception:
+            pass
+    return 3
+
+
+def parse_report_frame(df: pd.DataFrame, header_rows: int = 3) -> pd.DataFrame:
+    """
+    Reports sheet (read with header=None) -> one row per area and dimension, with the area's
+    target level. An area header names the area in column 0 (target level in column 8) and
+    may carry its first dimension in column 1; the rows below list further dimensions.
+    Areas without dimensions appear once with dimension None.
+    """
+    df = df.iloc[header_rows:]
+    area_text = _cell_str(_column(df, 0))
+    dimension = _cell_str(_column(df, 1))
+
+    is_area = (area_text != "") & (area_text != "nan")
+    area = area_text.where(is_area).ffill()
+    area_id = is_area.cumsum()
+    desired = _column(df, 8)[is_area].map(_desired_level)
+
+    has_dimension = (dimension != "") & (dimension != "nan") & (dimension != "Dimension") & area.notna()
+    rows = pd.DataFrame({
+        "area_index": area_id - 1,
+        "area": area,
+        "desired_level": desired.reindex(df.index).ffill(),
+        "dimension": dimension.where(has_dimension),
+    })[area.notna() & (has_dimension | is_area)]
+    # Keep an area's header row only when it has no dimensions at all
+    dimension_count = rows.groupby("area_index")["dimension"].transform("count")
+    rows = rows[rows["dimension"].notna() | (dimension_count == 0)]
+    rows = rows.astype({"area_index": int, "desired_level": int})
+    return rows[REPORT_COLUMNS].astype(object).where(rows[REPORT_COLUMNS].notna(), None).reset_index(drop=True)
+
+
+def report_areas(frame: pd.DataFrame):
+    """parse_report_frame output as [{"name", "desired_level", "dimensions": [names]}]"""
+    areas = []
+    for (_, area, desired_level), group in frame.groupby(["area_index", "area", "desired_level"], sort=False):
+        areas.append({
+            "name": area,
+            "desired_level": int(desired_level),
+            "dimensions": [name for name in group["dimension"] if name is not None],
+        })
+    return areas
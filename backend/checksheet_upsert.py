@@ -0,0 +1,145 @@
+"""
+Set-based bulk upsert for checksheet selections
+Classifies every incoming row against the stored selections with one lookup per batch,
+then writes only the changed rows with SQLite's INSERT ... ON CONFLICT DO UPDATE
+"""
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from database import ChecksheetSelection
+
+# Rows per INSERT/lookup statement - keeps bound parameters well under SQLite's limit
+DEFAULT_BATCH_SIZE = 500
+
+INSERTED = "inserted"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+
+
+def _batches(items: List, size: int) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _load_existing(db: Session, keys: List[Tuple[Optional[int], int]], batch_size: int) -> Dict:
+    """Fetch stored (is_selected, evidence) for the given (assessment_id, maturity_level_id) keys"""
+    existing = {}
+
+    keyed = [key for key in keys if key[0] is not None]
+    for batch in _batches(keyed, batch_size):
+        rows = db.query(
+            ChecksheetSelection.assessment_id,
+            ChecksheetSelection.maturity_level_id,
+            ChecksheetSelection.is_selected,
+            ChecksheetSelection.evidence,
+        ).filter(
+            # The plain IN on the leading column lets SQLite search the unique index;
+            # a row-value IN on its own is planned as a full scan
+            ChecksheetSelection.assessment_id.in_({key[0] for key in batch}),
+            tuple_(ChecksheetSelection.assessment_id, ChecksheetSelection.maturity_level_id).in_(batch)
+        ).all()
+        for assessment_id, maturity_level_id, is_selected, evidence in rows:
+            existing[(assessment_id, maturity_level_id)] = (bool(is_selected), evidence)
+
+    # Selections without an assessment are not covered by the unique index (NULLs never conflict)
+    unassigned = [key[1] for key in keys if key[0] is None]
+    for batch in _batches(unassigned, batch_size):
+        rows = db.query(ChecksheetSelection).filter(
+            ChecksheetSelection.assessment_id.is_(None),
+            ChecksheetSelection.maturity_level_id.in_(batch)
+        ).all()
+        for row in rows:
+            existing[(None, row.maturity_level_id)] = (bool(row.is_selected), row.evidence)
+
+    return existing
+
+
+def bulk_upsert_selections(db: Session, selections: List, batch_size: int = DEFAULT_BATCH_SIZE) -> List[Dict]:
+    """
+    Upsert checksheet selections in batches and return one outcome per input row.
+    Rows are applied in order, so a key repeated in the payload behaves exactly like
+    the per-row loop: the last value wins and earlier duplicates report their own outcome.
+    The caller owns the transaction (commit/rollback).
+    """
+    keys = []
+    seen = set()
+    for selection in selections:
+        key = (selection.assessment_id, selection.maturity_level_id)
+        if key not in seen:
+            seen.add(key)
+            keys.append(key)
+
+    state = _load_existing(db, keys, batch_size)
+    stored = dict(state)
+
+    outcomes = []
+    for selection in selections:
+        key = (selection.assessment_id, selection.maturity_level_id)
+        value = (bool(selection.is_selected), selection.evidence)
+        if key not in state:
+            outcome = INSERTED
+        elif state[key] == value:
+            outcome = UNCHANGED
+        else:
+            outcome = UPDATED
+        state[key] = value
+        outcomes.append({
+            "assessment_id": selection.assessment_id,
+            "maturity_level_id": selection.maturity_level_id,
+            "outcome": outcome
+        })
+
+    # Only keys whose final value differs from what is stored need a write
+    now = datetime.utcnow()
+    pending = [
+        {
+            "assessment_id": key[0],
+            "maturity_level_id": key[1],
+            "is_selected": value[0],
+            "evidence": value[1],
+            "created_at": now,
+            "updated_at": now,
+        }
+        for key, value in state.items()
+        if stored.get(key) != value
+    ]
+
+    keyed_rows = [row for row in pending if row["assessment_id"] is not None]
+    if keyed_rows:
+        stmt = sqlite_insert(ChecksheetSelection.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["assessment_id", "maturity_level_id"],
+            set_={
+                "is_selected": stmt.excluded.is_selected,
+                "evidence": stmt.excluded.evidence,
+                "updated_at": stmt.excluded.updated_at,
+            }
+        )
+        for batch in _batches(keyed_rows, batch_size):
+            db.execute(stmt, batch)
+
+    # Unassigned (demo) selections keep the row-by-row path
+    for row in pending:
+        if row["assessment_id"] is not None:
+            continue
+        existing = db.query(ChecksheetSelection).filter(
+            ChecksheetSelection.assessment_id.is_(None),
+            ChecksheetSelection.maturity_level_id == row["maturity_level_id"]
+        ).first()
+        if existing:
+            existing.is_selected = row["is_selected"]
+            existing.evidence = row["evidence"]
+            existing.updated_at = now
+        else:
+            db.add(ChecksheetSelection(
+                assessment_id=None,
+                maturity_level_id=row["maturity_level_id"],
+                is_selected=row["is_selected"],
+                evidence=row["evidence"]
+            ))
+
+    return outcomes
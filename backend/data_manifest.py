@@ -0,0 +1,166 @@
+"""
+Data manifest: which reference datasets are loaded, and from which sources
+Each dataset (DATASETS) is one loader in the seed/workbook chain, or one refresh endpoint,
+with the files its data depends on and the tables it writes. After a successful load the
+data_manifest table records the dataset's version and a hash of those files; the refresh
+endpoints, their background jobs and refresh_orchestrator record theirs in the transaction
+that writes the data (record_refreshed). At startup ensure_datasets() reads the manifest in
+one primary-key lookup and reloads only the datasets that are missing or stale - plus any
+later dataset in the chain whose tables a reload rewrites - instead of counting every table
+and reloading everything when one is empty. The seed data only fills gaps: it inserts missing
+rows, and only into tables no recorded workbook load has replaced, so a changed seed file never
+overwrites the workbook catalogs or what points at them. Loaders are imported only when they
+run. Rows without a source hash were adopted from a database populated before the manifest
+existed (migrations.adopt_loaded_datasets) and count as current.
+"""
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from importlib import import_module
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from database import DataManifest, engine
+from workbook_cache import content_hash
+
+BACKEND_DIR = Path(__file__).resolve().parent
+MM_DATA_WORKBOOK = BACKEND_DIR.parent / "frontend" / "src" / "components" / "M_M_Data" / "MM_Data.xlsx"
+# Where the refresh endpoints read from (load_rating_scales_data.find_checksheet_workbook,
+# load_reports_data.REPORTS_WORKBOOK_PATH)
+CHECKSHEET_WORKBOOK = MM_DATA_WORKBOOK.with_name("CheckSheetData.xlsx")
+REPORTS_WORKBOOK = BACKEND_DIR / "MM_Data.xlsx"
+MANIFEST = DataManifest.__table__
+
+
+@dataclass(frozen=True)
+class Dataset:
+    name: str
+    loader: Optional[str]  # "module:function"; None for data only a refresh endpoint writes
+    sources: Tuple[Path, ...]
+    tables: Tuple[str, ...]
+    version: int = 1  # bump when the loaded data changes without any source file changing
+    fills: bool = False  # inserts missing rows only, into the tables it is given (see pending_datasets)
+
+
+DATASETS = {dataset.name: dataset for dataset in [
+    Dataset("seed", "seed_data:load_seed_data", (BACKEND_DIR / "seed_data.py",),
+            ("areas", "dimensions", "maturity_levels", "rating_scales"), fills=True),
+    Dataset("maturity_levels", "load_simulated_data:load_smart_factory_data",
+            (MM_DATA_WORKBOOK, BACKEND_DIR / "load_simulated_data.py"), ("maturity_levels",)),
+    Dataset("rating_scales", "update_rating_scales:update_rating_scales",
+            (MM_DATA_WORKBOOK, BACKEND_DIR / "update_rating_scales.py"), ("rating_scales",)),
+    Dataset("reports", "load_reports_data:load_reports_simulated_data",
+            (MM_DATA_WORKBOOK, BACKEND_DIR / "load_reports_data.py"), ("areas", "dimensions")),
+    # Written by the refresh endpoints (and refresh-all) in main.py
+    Dataset("report_areas", None, (REPORTS_WORKBOOK, BACKEND_DIR / "load_reports_data.py"), ("areas", "dimensions")),
+    Dataset("checksheet_rating_scales", None, (CHECKSHEET_WORKBOOK, BACKEND_DIR / "load_rating_scales_data.py"),
+            ("rating_scales",)),
+    Dataset("checksheet_maturity_levels", None, (CHECKSHEET_WORKBOOK, BACKEND_DIR / "load_checksheet_data.py"),
+            ("maturity_levels",)),
+]}
+
+# Local development starts from the seed data; serverless deployments (and the snapshot) load
+# the MM_Data.xlsx catalogs over it, in this order
+LOCAL_DATASETS = ["seed"]
+REFERENCE_DATASETS = ["seed", "maturity_levels", "rating_scales", "reports"]
+
+
+def source_file_hash(path: Path) -> str:
+    """
+    Content hash of a source file, "missing" if absent. Text sources are hashed with LF line
+    endings, so a CRLF checkout (the Windows .bat tooling) hashes the same as the deployed files.
+    """
+    if not path.exists():
+        return "missing"
+    if path.suffix != ".py":
+        return content_hash(path)
+    return hashlib.blake2b(path.read_bytes().replace(b"\r\n", b"\n"), digest_size=16).hexdigest()
+
+
+def source_hash(dataset: Dataset) -> str:
+    """Hash of the dataset's source files; a missing file counts as changed"""
+    material = [f"{path.name}={source_file_hash(path)}" for path in dataset.sources]
+    return hashlib.blake2b("|".join(material).encode(), digest_size=16).hexdigest()
+
+
+def read_manifest(conn, names: Sequence[str] = tuple(DATASETS)) -> Dict[str, Tuple]:
+    """name -> (version, source_hash) of the recorded datasets among `names`, in one query"""
+    # Core rather than ORM: at startup the first ORM query would configure every mapper first
+    rows = conn.execute(
+        select(MANIFEST.c.name, MANIFEST.c.version, MANIFEST.c.source_hash).where(MANIFEST.c.name.in_(names))
+    )
+    return {name: (version, recorded_hash) for name, version, recorded_hash in rows}
+
+
+def pending_datasets(names: Sequence[str], recorded: Dict[str, Tuple]) -> Dict[str, Tuple[str, ...]]:
+    """
+    The datasets of `names` to (re)load, in chain order, with the tables each is to write.
+    A filling dataset (the seed) is left out of every table a recorded load has replaced.
+    """
+    replaced = {table for dataset in DATASETS.values() if not dataset.fills and dataset.name in recorded
+                for table in dataset.tables}
+    pending, rewritten = {}, set()
+    for name in names:
+        dataset = DATASETS[name]
+        tables = tuple(table for table in dataset.tables if not (dataset.fills and table in replaced))
+        if not tables:
+            continue
+        state = recorded.get(name)
+        current = state is not None and (state[1] is None or state == (dataset.version, source_hash(dataset)))
+        if not current or rewritten.intersection(tables):
+            pending[name] = tables
+            rewritten.update(tables)
+    return pending
+
+
+def record_loaded(conn, dataset: Dataset):
+    stmt = sqlite_insert(MANIFEST).values(
+        name=dataset.name, version=dataset.version, source_hash=source_hash(dataset), loaded_at=datetime.utcnow()
+    )
+    conn.execute(stmt.on_conflict_do_update(
+        index_elements=["name"],
+        set_={"version": stmt.excluded.version, "source_hash": stmt.excluded.source_hash,
+              "loaded_at": stmt.excluded.loaded_at}
+    ))
+
+
+def record_refreshed(db: Session, *names: str):
+    """Record the datasets a refresh wrote through `db`, in its transaction; the caller commits"""
+    conn = db.connection()
+    for name in names:
+        record_loaded(conn, DATASETS[name])
+
+
+def ensure_datasets(names: Sequence[str]) -> Dict[str, str]:
+    """
+    Load the datasets of `names` that are missing or stale. Returns name -> "current",
+    "loaded" or "failed"; a failed dataset is reported and left unrecorded, so the next
+    startup tries it again, and the data already in its tables stays in place.
+    """
+    with engine.connect() as conn:
+        recorded = read_manifest(conn)
+    pending = pending_datasets(names, recorded)
+    status = {name: "current" for name in names if name not in pending}
+    if pending:
+        print(f"📊 Loading reference data: {', '.join(pending)}")
+    for name, tables in pending.items():
+        dataset = DATASETS[name]
+        module, function = dataset.loader.split(":")
+        try:
+            load = getattr(import_module(module), function)
+            if dataset.fills:
+                load(tables)
+            else:
+                load()
+            with engine.begin() as conn:
+                record_loaded(conn, dataset)
+            status[name] = "loaded"
+            print(f"✅ {name} data loaded")
+        except Exception as e:
+            status[name] = "failed"
+            print(f"⚠️ {name} loading error: {e}")
+    return {name: status[name] for name in names}
@@ -1,10 +1,13 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
 import os
 from pathlib import Path
 
+from migrations import run_migrations
+from naming import normalize_dimension_name
+
 # For serverless, use /tmp directory for SQLite database
 if os.environ.get('VERCEL'):
     # Vercel serverless environment
@@ -15,9 +18,54 @@ else:
 
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_PATH}"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+# SQLite connection tuning - every value can be overridden through the environment.
+# WAL lets readers run alongside a writer, NORMAL sync is durable in WAL mode, and
+# busy_timeout makes concurrent writers wait for the lock instead of failing at once.
+SQLITE_PRAGMA_DEFAULTS = {
+    "journal_mode": ("MM_SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": ("MM_SQLITE_SYNCHRONOUS", "NORMAL"),
+    "mmap_size": ("MM_SQLITE_MMAP_SIZE", "268435456"),  # 256 MB
+    "cache_size": ("MM_SQLITE_CACHE_SIZE", "-65536"),  # negative = KiB, i.e. 64 MB per connection
+    "temp_store": ("MM_SQLITE_TEMP_STORE", "MEMORY"),
+    "busy_timeout": ("MM_SQLITE_BUSY_TIMEOUT_MS", "5000"),
+}
+
+# Starlette runs sync endpoints on a 40-thread pool, so keep that many connections warm.
+# Overflow is unbounded (-1): get_db only releases a connection in its teardown, which itself
+# waits for a threadpool slot, so a hard cap can deadlock under heavy concurrency.
+DEFAULT_POOL_SIZE = int(os.environ.get("MM_DB_POOL_SIZE", "40"))
+DEFAULT_MAX_OVERFLOW = int(os.environ.get("MM_DB_MAX_OVERFLOW", "-1"))
+DEFAULT_POOL_TIMEOUT = int(os.environ.get("MM_DB_POOL_TIMEOUT", "30"))
+
+def sqlite_pragmas_from_env():
+    """Resolve the PRAGMA settings, or an empty dict when MM_SQLITE_TUNING=0"""
+    if os.environ.get("MM_SQLITE_TUNING", "1") == "0":
+        return {}
+    return {pragma: os.environ.get(env_var, default) for pragma, (env_var, default) in SQLITE_PRAGMA_DEFAULTS.items()}
+
+def create_db_engine(url=SQLALCHEMY_DATABASE_URL, pragmas=None, pool_size=None, max_overflow=None):
+    """Build a SQLite engine with tuned PRAGMAs applied to every new connection"""
+    if pragmas is None:
+        pragmas = sqlite_pragmas_from_env()
+    db_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        pool_size=DEFAULT_POOL_SIZE if pool_size is None else pool_size,
+        max_overflow=DEFAULT_MAX_OVERFLOW if max_overflow is None else max_overflow,
+        pool_timeout=DEFAULT_POOL_TIMEOUT,
+    )
+
+    if pragmas:
+        @event.listens_for(db_engine, "connect")
+        def apply_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma, value in pragmas.items():
+                cursor.execute(f"PRAGMA {pragma}={value}")
+            cursor.close()
+
+    return db_engine
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -39,7 +87,7 @@ class Dimension(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
-    area_id = Column(Integer, ForeignKey("areas.id"))
+    area_id = Column(Integer, ForeignKey("areas.id"), index=True)
     current_level = Column(Integer, default=1)
     desired_level = Column(Integer, default=3)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -49,6 +97,9 @@ class Dimension(Base):
 
 class MaturityLevel(Base):
     __tablename__ = "maturity_levels"
+    __table_args__ = (
+        Index("ix_maturity_levels_dimension_level_sub_level", "dimension_id", "level", "sub_level"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     dimension_id = Column(Integer, ForeignKey("dimensions.id"), nullable=True)  # Link to dimension
@@ -66,14 +117,25 @@ class RatingScale(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     dimension_name = Column(String, index=True)
+    normalized_name = Column(String, index=True)  # normalize_dimension_name(dimension_name), set on save
     level = Column(Integer)
     rating_name = Column(String)  # e.g., "1 – Basic Connectivity"
     digital_maturity_description = Column(Text)
     business_relevance = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+@event.listens_for(RatingScale, "before_insert")
+@event.listens_for(RatingScale, "before_update")
+def set_rating_scale_normalized_name(mapper, connection, target):
+    target.normalized_name = normalize_dimension_name(target.dimension_name)
+
 class Assessment(Base):
     __tablename__ = "assessments"
+    __table_args__ = (
+        # Filtered, newest-first listing of GET /api/mm/assessments
+        Index("ix_assessments_plant_created", "plant_name", "created_at"),
+        Index("ix_assessments_shop_unit_created", "shop_unit", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     area_id = Column(Integer, ForeignKey("areas.id"), nullable=True)
@@ -98,7 +160,7 @@ class Assessment(Base):
     # Count tracking
     overall_count = Column(Integer, default=0)
     checked_count = Column(Integer, default=0)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)  # cursor pagination key
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     area = relationship("Area", back_populates="assessments")
@@ -106,6 +168,10 @@ class Assessment(Base):
 
 class DimensionAssessment(Base):
     __tablename__ = "dimension_assessments"
+    __table_args__ = (
+        # One calculated level per dimension per assessment
+        Index("uq_dimension_assessment_assessment_dimension", "assessment_id", "dimension_id", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     assessment_id = Column(Integer, ForeignKey("assessments.id"))
@@ -121,6 +187,11 @@ class DimensionAssessment(Base):
 
 class ChecksheetSelection(Base):
     __tablename__ = "checksheet_selections"
+    __table_args__ = (
+        # One selection per criterion per assessment - target of the bulk upsert
+        Index("uq_checksheet_selection_assessment_level", "assessment_id", "maturity_level_id", unique=True),
+        Index("ix_checksheet_selections_assessment_selected", "assessment_id", "is_selected"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     assessment_id = Column(Integer, ForeignKey("assessments.id"), nullable=True)
@@ -132,9 +203,50 @@ class ChecksheetSelection(Base):
     
     maturity_level = relationship("MaturityLevel")
 
-# Create all tables
-def init_db():
-    Base.metadata.create_all(bind=engine)
+class AreaSummary(Base):
+    """Denormalized per-area counters behind GET /api/mm/reports/summary (see area_summary.py)"""
+    __tablename__ = "area_summary"
+    
+    area_id = Column(Integer, ForeignKey("areas.id"), primary_key=True)
+    area_name = Column(String)
+    desired_level = Column(Integer, nullable=True)
+    total_dimensions = Column(Integer, default=0)
+    current_level_sum = Column(Integer, default=0)
+    on_track_count = Column(Integer, default=0)
+    completed_count = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class Job(Base):
+    """A background job (data refreshes) and its progress - see jobs.py"""
+    __tablename__ = "jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, index=True)  # e.g. "refresh_reports"
+    status = Column(String, index=True, default="queued")  # queued, running, succeeded, failed, cancelled
+    progress = Column(Float, default=0.0)  # 0..1, completed stages / total stages
+    current_stage = Column(String, nullable=True)
+    stages = Column(Text, nullable=True)  # JSON list of {"name", "status", "seconds", "rows"}
+    result = Column(Text, nullable=True)  # JSON
+    error = Column(Text, nullable=True)
+    cancel_requested = Column(Boolean, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+class DataManifest(Base):
+    """Reference datasets loaded into this database and the sources they came from - see data_manifest.py"""
+    __tablename__ = "data_manifest"
+
+    name = Column(String, primary_key=True)  # e.g. "seed", "rating_scales"
+    version = Column(Integer, nullable=True)  # None (with source_hash) for data loaded before the manifest existed
+    source_hash = Column(String, nullable=True)
+    loaded_at = Column(DateTime, default=datetime.utcnow)
+
+# Create all tables, then bring older databases up to date (see migrations.py)
+def init_db(db_engine=None):
+    db_engine = db_engine or engine
+    Base.metadata.create_all(bind=db_engine)
+    run_migrations(db_engine)
 
 # Dependency
 def get_db():
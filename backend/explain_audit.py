@@ -0,0 +1,138 @@
+"""
+EXPLAIN QUERY PLAN audit for the /api/mm endpoints
+Calls each endpoint against a migrated scratch copy of the database, captures every SQL
+statement it runs and asks SQLite for the plan. A statement that filters (WHERE) yet scans a
+table end to end is reported as a finding and makes the script exit with code 1; scans of
+statements that read a whole table by design are listed as expected.
+
+Usage:
+    python explain_audit.py [--source manufacturing.db] [--verbose]
+"""
+import argparse
+import os
+import re
+import shutil
+import sys
+import tempfile
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from database import Assessment, Dimension, create_db_engine, get_db, init_db
+from main import app
+from query_counter import count_queries
+from reference_cache import reference_cache
+
+# (method, path, json body); {assessment_id} / {dimension_id} / {area_id} are filled in from the data
+REQUESTS = [
+    ("GET", "/api/mm/areas", None),
+    ("GET", "/api/mm/areas/{area_id}", None),
+    ("GET", "/api/mm/dimensions", None),
+    ("GET", "/api/mm/maturity-levels", None),
+    ("GET", "/api/mm/maturity-levels?dimension_id={dimension_id}", None),
+    ("GET", "/api/mm/rating-scales", None),
+    ("GET", "/api/mm/rating-scales/Asset Connectivity and OEE", None),
+    ("GET", "/api/mm/rating-scales/connectivity", None),
+    ("GET", "/api/mm/assessments", None),
+    ("GET", "/api/mm/assessments/{assessment_id}", None),
+    ("GET", "/api/mm/checksheet-selections/{assessment_id}", None),
+    ("GET", "/api/mm/reports/summary", None),
+    ("PUT", "/api/mm/dimensions/{dimension_id}", {"current_level": 3}),
+    ("POST", "/api/mm/simulate-update/{dimension_id}", None),
+    ("POST", "/api/mm/checksheet-selections?bulk=true", "selections"),
+    ("POST", "/api/mm/calculate-dimension-scores?assessment_id={assessment_id}", None),
+    ("POST", "/api/mm/assessments/score-batch", {"assessment_ids": ["{assessment_id}"], "dry_run": True}),
+]
+
+FULL_SCAN = re.compile(r"^SCAN (?!\d+ CONSTANT ROW)")
+FILTERED = re.compile(r"\bWHERE\b", re.IGNORECASE)
+
+# Filtered statements that read every row by design, with the reason
+EXPECTED_SCANS = [
+    (re.compile(r"\bGLOB\b"), "scoring aggregates every lettered criterion; GLOB cannot use an index"),
+]
+
+
+def plan_for(conn, statement, parameters, executemany):
+    if executemany:
+        parameters = parameters[0] if parameters else ()
+    return [row[3] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default="manufacturing.db")
+    parser.add_argument("--verbose", action="store_true", help="print every plan, not only the scans")
+    args = parser.parse_args()
+
+    findings = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "audit.db")
+        shutil.copyfile(args.source, path)
+        engine = create_db_engine(f"sqlite:///{path}")
+        init_db(engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        db = Session()
+        ids = {
+            "assessment_id": db.query(Assessment.id).order_by(Assessment.id).first()[0],
+            "dimension_id": db.query(Dimension.id).order_by(Dimension.id).first()[0],
+            "area_id": db.query(Dimension.area_id).order_by(Dimension.id).first()[0],
+        }
+        db.close()
+
+        def override_get_db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        # Every request must reach the database for its queries to be audited
+        max_entries, reference_cache.max_entries = reference_cache.max_entries, 0
+        app.dependency_overrides[get_db] = override_get_db
+        client = TestClient(app)
+        try:
+            for method, route, body in REQUESTS:
+                path = route.format(**ids)
+                if body == "selections":
+                    body = [{"assessment_id": ids["assessment_id"], "maturity_level_id": level_id, "is_selected": True}
+                            for level_id in (1, 2, 3)]
+                elif isinstance(body, dict):
+                    body = {key: [int(v.format(**ids)) for v in value] if key == "assessment_ids" else value
+                            for key, value in body.items()}
+                reference_cache.clear()
+                with count_queries(engine) as counter:
+                    response = client.request(method, path, json=body)
+                print(f"{method:4} {path} -> {response.status_code}, {counter.count} statements")
+
+                with engine.connect() as conn:
+                    for statement, parameters, executemany in counter.executions:
+                        if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "INSERT")):
+                            continue
+                        plan = plan_for(conn, statement, parameters, executemany)
+                        scans = [step for step in plan if FULL_SCAN.match(step)]
+                        filtered = bool(FILTERED.search(statement))
+                        reason = next((why for pattern, why in EXPECTED_SCANS if pattern.search(statement)), None)
+                        if scans or args.verbose:
+                            if scans and filtered and not reason:
+                                label = "FULL SCAN"
+                                findings += 1
+                            elif scans:
+                                label = f"scan (expected{': ' + reason if reason else ''})"
+                            else:
+                                label = "ok"
+                            print(f"    {label}: {' '.join(statement.split())[:150]}")
+                            for step in plan:
+                                print(f"        {step}")
+        finally:
+            reference_cache.max_entries = max_entries
+            app.dependency_overrides.pop(get_db, None)
+            engine.dispose()
+
+    print(f"\n{findings} filtered statement(s) with a full table scan")
+    sys.exit(1 if findings else 0)
+
+
+if __name__ == "__main__":
+    main()
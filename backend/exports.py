@@ -0,0 +1,109 @@
+"""
+Streaming exports of checksheet selections (NDJSON or CSV)
+Rows are read with yield_per from a session owned by the generator - FastAPI closes request
+dependencies before a StreamingResponse body is sent - and written out in fixed-size chunks,
+so memory stays flat however large the table is.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Iterator, List, Optional
+
+from sqlalchemy import select
+
+from database import Assessment, ChecksheetSelection, MaturityLevel, SessionLocal
+
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Rows fetched per round trip, and rows per chunk handed to the response
+EXPORT_BATCH_SIZE = 1000
+
+SELECTION_COLUMNS = [
+    ChecksheetSelection.id,
+    ChecksheetSelection.assessment_id,
+    ChecksheetSelection.maturity_level_id,
+    ChecksheetSelection.is_selected,
+    ChecksheetSelection.evidence,
+    ChecksheetSelection.created_at,
+    ChecksheetSelection.updated_at,
+]
+# Optional joined metadata, by ?include= name
+INCLUDE_COLUMNS = {
+    "maturity_level": [
+        MaturityLevel.dimension_id,
+        MaturityLevel.level,
+        MaturityLevel.sub_level,
+        MaturityLevel.category,
+        MaturityLevel.name.label("maturity_level_name"),
+    ],
+    "assessment": [
+        Assessment.plant_name,
+        Assessment.shop_unit,
+        Assessment.assessor_name,
+        Assessment.assessment_date,
+    ],
+}
+
+
+def build_export_query(
+    include: List[str],
+    assessment_id: Optional[int] = None,
+    plant_name: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+):
+    columns = list(SELECTION_COLUMNS)
+    for name in include:
+        columns += INCLUDE_COLUMNS[name]
+    query = select(*columns)
+    if "maturity_level" in include:
+        query = query.outerjoin(MaturityLevel, MaturityLevel.id == ChecksheetSelection.maturity_level_id)
+    if "assessment" in include or plant_name:
+        query = query.outerjoin(Assessment, Assessment.id == ChecksheetSelection.assessment_id)
+    if assessment_id is not None:
+        query = query.where(ChecksheetSelection.assessment_id == assessment_id)
+    if plant_name:
+        query = query.where(Assessment.plant_name == plant_name)
+    if created_from:
+        query = query.where(ChecksheetSelection.created_at >= created_from)
+    if created_to:
+        query = query.where(ChecksheetSelection.created_at <= created_to)
+    return query.order_by(ChecksheetSelection.id)
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value):
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+
+def stream_selections(query, fmt: str = "ndjson", session_factory=SessionLocal) -> Iterator[str]:
+    """Yield the export in chunks of EXPORT_BATCH_SIZE rows; opens and closes its own session"""
+    db = session_factory()
+    try:
+        result = db.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        keys = list(result.keys())
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(keys)
+            for rows in result.partitions():
+                writer.writerows([_csv_value(value) for value in row] for row in rows)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
+        else:
+            for rows in result.partitions():
+                yield "".join(
+                    json.dumps(dict(zip(keys, row)), default=_json_default, ensure_ascii=False) + "\n"
+                    for row in rows
+                )
+    finally:
+        db.close()
@@ -0,0 +1,93 @@
+"""
+Import-time digest for backend startup
+Imports a module (main by default) in a fresh interpreter with `python -X importtime` and
+condenses the raw per-module log into what matters for cold starts: the total, the top-level
+packages ranked by the time spent importing them (self time summed over their submodules),
+and the slowest backend modules with their cumulative time. Only the target's own import tree
+is counted, not the interpreter's site setup. check_import_budget.py prints the same digest
+when the budget is exceeded.
+
+Usage:
+    python importtime_report.py [--module main] [--top 15]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent
+
+
+def import_env() -> Dict[str, str]:
+    """The environment of a plain local start: no serverless or async-stack switches"""
+    env = {key: value for key, value in os.environ.items() if key not in ("VERCEL", "MM_DB_ASYNC")}
+    env["PYTHONPATH"] = str(BACKEND_DIR)
+    return env
+
+
+def run_importtime(module: str) -> List[Tuple[str, int, int, int]]:
+    """(name, depth, self us, cumulative us) for every module `import <module>` loads, in log order"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=import_env(), capture_output=True, text=True, check=True
+    )
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        entries.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return entries
+
+
+def target_tree(entries, module: str):
+    """The entries imported on behalf of `module`, ending with its own (modules log after their imports)"""
+    for end in range(len(entries) - 1, -1, -1):
+        name, depth = entries[end][:2]
+        if depth == 0 and name == module:
+            start = end
+            while start > 0 and entries[start - 1][1] > 0:
+                start -= 1
+            return entries[start:end + 1]
+    raise ValueError(f"{module} not found in the -X importtime output")
+
+
+def digest(module: str = "main", top: int = 15) -> Dict:
+    tree = target_tree(run_importtime(module), module)
+    packages = defaultdict(int)
+    for name, _, self_us, _ in tree:
+        packages[name.split(".")[0]] += self_us
+    local = {path.stem for path in BACKEND_DIR.glob("*.py")}
+    backend = [(name, cumulative) for name, _, _, cumulative in tree if name.split(".")[0] in local]
+    return {
+        "module": module,
+        "total_ms": tree[-1][3] / 1000,
+        "modules": len(tree),
+        "packages": [(name, us / 1000) for name, us in sorted(packages.items(), key=lambda item: -item[1])[:top]],
+        "backend": [(name, us / 1000) for name, us in sorted(backend, key=lambda item: -item[1])[:top]],
+    }
+
+
+def format_digest(report: Dict) -> str:
+    lines = [f"import {report['module']}: {report['total_ms']:.0f} ms, {report['modules']} modules"]
+    lines.append("  by package (self time):")
+    lines += [f"    {ms:8.1f} ms  {name}" for name, ms in report["packages"]]
+    lines.append("  backend modules (cumulative):")
+    lines += [f"    {ms:8.1f} ms  {name}" for name, ms in report["backend"]]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    print(format_digest(digest(args.module, args.top)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Background jobs for long-running data refreshes
+A job is a row in the jobs table plus an ordered list of named stages, run by a small thread
+pool (MM_JOB_WORKERS, default 1 so refreshes never write concurrently) while the request that
+queued it returns 202 Accepted. The runner records each stage's duration and row count,
+advances progress between stages and honours cancellation at stage boundaries. Within a stage,
+the progress callback it is handed records partial progress and details (e.g. per-workbook
+timings and rows) and raises JobCancelled once a cancel is requested; otherwise a stage that
+has started runs to completion, since the loaders commit their own work. The final stage
+cannot be cancelled - cancel() raises JobNotCancellable rather than accept a request nothing
+would act on. A job always ends
+in a final status, even when recording its progress fails. Jobs still queued or running when
+the process stopped are marked failed on the next startup.
+"""
+import json
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from database import Job, SessionLocal
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+JOB_WORKERS = int(os.environ.get("MM_JOB_WORKERS", "1"))
+# Attempts at writing a job's final status (each waits out the connection's busy_timeout)
+FINISH_ATTEMPTS = 3
+
+# progress(fraction of the stage done, **details to record on the stage)
+Progress = Callable[..., None]
+# (stage name, function(session, progress) -> number of rows written, or read by a parse stage)
+Stage = Tuple[str, Callable[[Session, Progress], int]]
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobNotCancellable(Exception):
+    pass
+
+
+def job_response(job: Job) -> dict:
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "progress": job.progress,
+        "current_stage": job.current_stage,
+        "stages": json.loads(job.stages) if job.stages else [],
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+        "cancel_requested": job.cancel_requested,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+class JobRunner:
+    def __init__(self, session_factory=SessionLocal, workers: int = JOB_WORKERS):
+        self.session_factory = session_factory
+        self.workers = workers
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="mm-job")
+            return self._pool
+
+    def _update(self, job_id: int, *conditions, **values) -> int:
+        with self.session_factory() as db:
+            result = db.execute(update(Job).where(Job.id == job_id, *conditions).values(**values))
+            db.commit()
+            return result.rowcount
+
+    def submit(self, kind: str, stages: List[Stage]) -> dict:
+        """Queue a job and return its initial state"""
+        records = [{"name": name, "status": "pending", "seconds": None, "rows": None} for name, _ in stages]
+        with self.session_factory() as db:
+            job = Job(kind=kind, status=QUEUED, progress=0.0, stages=json.dumps(records), cancel_requested=False)
+            db.add(job)
+            db.commit()
+            response = job_response(job)
+        self._executor().submit(self._run, response["id"], stages, records)
+        return response
+
+    def get(self, job_id: int) -> Optional[dict]:
+        with self.session_factory() as db:
+            job = db.get(Job, job_id)
+            return job_response(job) if job else None
+
+    def recent(self, limit: int = 20) -> List[dict]:
+        with self.session_factory() as db:
+            jobs = db.execute(select(Job).order_by(Job.id.desc()).limit(limit)).scalars().all()
+            return [job_response(job) for job in jobs]
+
+    def cancel(self, job_id: int) -> Optional[dict]:
+        """
+        Cancel a queued job outright, or ask a running one to stop at its next stage boundary or
+        progress report. Raises JobNotCancellable while a job is in its final stage.
+        """
+        # Read first: a final apply stage holds the write lock until it commits
+        job = self.get(job_id)
+        if job is None or job["status"] not in (QUEUED, RUNNING):
+            return job
+        final_stage = job["stages"][-1]["name"]
+        not_cancellable = JobNotCancellable(f"Job {job_id} is in its final stage ({final_stage}) and will run to completion")
+        if job["status"] == RUNNING and job["current_stage"] == final_stage:
+            raise not_cancellable
+        if not self._update(job_id, Job.status == QUEUED, status=CANCELLED, cancel_requested=True,
+                            finished_at=datetime.utcnow()):
+            # Atomic with the runner entering its final stage, which sets current_stage before
+            # it checks for a cancel
+            if not self._update(job_id, Job.status == RUNNING,
+                                or_(Job.current_stage.is_(None), Job.current_stage != final_stage),
+                                cancel_requested=True):
+                job = self.get(job_id)
+                if job["status"] == RUNNING:
+                    raise not_cancellable
+                return job
+        return self.get(job_id)
+
+    def _cancel_requested(self, job_id: int) -> bool:
+        with self.session_factory() as db:
+            return bool(db.execute(select(Job.cancel_requested).where(Job.id == job_id)).scalar())
+
+    def _stage_progress(self, job_id: int, index: int, records: List[dict]) -> Progress:
+        def progress(done: float, **details):
+            records[index].update(details)
+            self._update(job_id, progress=(index + done) / len(records), stages=json.dumps(records))
+            if self._cancel_requested(job_id):
+                raise JobCancelled()
+        return progress
+
+    def _finish(self, job_id: int, status: str, **values):
+        """
+        Move the job to a final status. Retried while another writer holds the database lock, so a
+        job whose stages have stopped never stays running until the next restart.
+        """
+        for attempt in range(1, FINISH_ATTEMPTS + 1):
+            try:
+                self._update(job_id, status=status, finished_at=datetime.utcnow(), **values)
+                return
+            except Exception:
+                if attempt == FINISH_ATTEMPTS:
+                    traceback.print_exc()
+                    return
+                time.sleep(attempt * 0.5)
+
+    def _run(self, job_id: int, stages: List[Stage], records: List[dict]):
+        record, start = None, time.perf_counter()
+        try:
+            # Claim the job; a cancelled (or recovered) job is no longer queued
+            if not self._update(job_id, Job.status == QUEUED, status=RUNNING, started_at=datetime.utcnow()):
+                return
+            for index, (name, stage) in enumerate(stages):
+                start = time.perf_counter()
+                record = records[index]
+                record["status"] = "running"
+                # Enter the stage before checking for a cancel (see cancel)
+                self._update(job_id, current_stage=name, stages=json.dumps(records))
+                if self._cancel_requested(job_id):
+                    raise JobCancelled()
+                with self.session_factory() as db:
+                    rows = stage(db, self._stage_progress(job_id, index, records))
+                record.update(status="done", seconds=round(time.perf_counter() - start, 3), rows=rows)
+                record = None
+                self._update(job_id, progress=(index + 1) / len(stages), stages=json.dumps(records))
+            self._finish(
+                job_id, SUCCEEDED, current_stage=None,
+                result=json.dumps({"rows": {r["name"]: r["rows"] for r in records}})
+            )
+        except JobCancelled:
+            if record is not None:
+                record.update(status="cancelled", seconds=round(time.perf_counter() - start, 3))
+            self._finish(job_id, CANCELLED, current_stage=None, stages=json.dumps(records))
+        except Exception as e:
+            traceback.print_exc()
+            if record is not None:
+                record.update(status="failed", seconds=round(time.perf_counter() - start, 3))
+            self._finish(job_id, FAILED, stages=json.dumps(records), error=str(e))
+
+    def recover_interrupted(self) -> int:
+        """Mark jobs left queued/running by a previous process as failed"""
+        with self.session_factory() as db:
+            result = db.execute(
+                update(Job).where(Job.status.in_([QUEUED, RUNNING]))
+                .values(status=FAILED, error="Interrupted by a server restart", finished_at=datetime.utcnow())
+            )
+            db.commit()
+            return result.rowcount
+
+    def shutdown(self, wait: bool = False):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait, cancel_futures=True)
+                self._pool = None
+
+
+job_runner = JobRunner()
@@ -0,0 +1,400 @@
+"""
+Legacy portfolio simulation (/api/v1/portfolio)
+The pre-M&M app-portfolio demo, served from its own SQLite file (app.db) through the sqlite3
+module rather than SQLAlchemy. Kept out of main so it is only imported when the endpoint is
+called; main.get_portfolio_simulation imports it on first use.
+"""
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+# Old SQLite DB_PATH - only used for legacy functions if needed
+# In Vercel serverless, use /tmp directory
+if os.environ.get('VERCEL'):
+    DB_PATH = Path("/tmp/app.db")
+else:
+    DB_PATH = Path(__file__).with_name("app.db")
+
+
+class AppMetrics(BaseModel):
+    dc: int
+    tf: int
+    dr: int
+    der: int
+    er: int
+    gross: float
+
+
+def calculate_confidence(metrics: AppMetrics):
+    avg_score = metrics.dc + metrics.tf + metrics.dr + metrics.der + metrics.er
+    conf_pct = (avg_score / 25) * 100
+
+    if conf_pct >= 75:
+        band = "High (Committable)"
+    elif conf_pct >= 50:
+        band = "Medium (Conditional)"
+    else:
+        band = "Low (Aspirational)"
+
+    weighted = (conf_pct / 100) * metrics.gross
+    return round(conf_pct, 1), band, round(weighted, 2)
+
+
+def get_connection() -> sqlite3.Connection:
+    """Legacy SQLite connection - prefer using SQLAlchemy database"""
+    if os.environ.get('VERCEL'):
+        # In Vercel, /tmp is the only writable directory
+        db_path = Path("/tmp/app.db")
+    else:
+        db_path = DB_PATH
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def init_old_sqlite_db() -> None:
+    """Legacy init function - NOT USED in current version"""
+    # This function is kept for backward compatibility but not called
+    # SQLAlchemy database.py handles all database initialization now
+    pass
+    schema = """
+    CREATE TABLE IF NOT EXISTS segments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE
+    );
+
+    CREATE TABLE IF NOT EXISTS apps (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        segment_id INTEGER NOT NULL,
+        gross REAL NOT NULL,
+        dc INTEGER NOT NULL,
+        tf INTEGER NOT NULL,
+        dr INTEGER NOT NULL,
+        der INTEGER NOT NULL,
+        er INTEGER NOT NULL,
+        strategy TEXT NOT NULL,
+        FOREIGN KEY(segment_id) REFERENCES segments(id)
+    );
+
+    CREATE TABLE IF NOT EXISTS app_findings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        app_id TEXT NOT NULL,
+        detail TEXT NOT NULL,
+        FOREIGN KEY(app_id) REFERENCES apps(id)
+    );
+
+    CREATE TABLE IF NOT EXISTS governance_raci (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        task TEXT NOT NULL,
+        ddo TEXT NOT NULL,
+        it TEXT NOT NULL,
+        board TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS governance_gates (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        gate TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS change_plan (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        week TEXT NOT NULL,
+        title TEXT NOT NULL,
+        desc TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS stakeholders (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        impact TEXT NOT NULL,
+        focus TEXT NOT NULL,
+        strategy TEXT NOT NULL
+    );
+    """
+
+    with closing(get_connection()) as conn:
+        cur = conn.cursor()
+        cur.executescript(schema)
+
+        segments = [
+            "Finance & GBS",
+            "Supply Chain & Logistics",
+            "R&D & Innovation",
+            "Operations & Manufacturing",
+        ]
+        cur.executemany("INSERT OR IGNORE INTO segments(name) VALUES (?)", [(s,) for s in segments])
+
+        app_seed = [
+            {
+                "id": "A-101",
+                "name": "Legacy Finance Reporting Tool",
+                "segment": "Finance & GBS",
+                "gross": 1.10,
+                "dc": 5,
+                "tf": 5,
+                "dr": 4,
+                "der": 5,
+                "er": 4,
+                "strategy": "Elimination First",
+                "findings": [
+                    "Redundant with Target Architecture 2030",
+                    "High manual data reconciliation",
+                    "License expires Q3 2026",
+                ],
+            },
+            {
+                "id": "A-699",
+                "name": "Shadow IT Collaboration Tool",
+                "segment": "Finance & GBS",
+                "gross": 0.38,
+                "dc": 5,
+                "tf": 5,
+                "dr": 5,
+                "der": 4,
+                "er": 5,
+                "strategy": "Elimination",
+                "findings": [
+                    "Duplicate of standard MS Teams",
+                    "Security non-compliant",
+                    "High data leakage risk",
+                ],
+            },
+            {
+                "id": "A-214",
+                "name": "Custom Procurement Workflow",
+                "segment": "Supply Chain & Logistics",
+                "gross": 0.95,
+                "dc": 4,
+                "tf": 4,
+                "dr": 3,
+                "der": 4,
+                "er": 3,
+                "strategy": "Migration",
+                "findings": [
+                    "Move to BASF SAP Core",
+                    "Technical debt > 40%",
+                    "Process standardization required",
+                ],
+            },
+            {
+                "id": "A-387",
+                "name": "R&D Lab Data Tracker",
+                "segment": "R&D & Innovation",
+                "gross": 0.85,
+                "dc": 3,
+                "tf": 3,
+                "dr": 2,
+                "der": 3,
+                "er": 2,
+                "strategy": "Retain & Modernize",
+                "findings": [
+                    "Niche functionality not in global ERP",
+                    "Low integration readiness",
+                    "User adoption key challenge",
+                ],
+            },
+            {
+                "id": "A-512",
+                "name": "Plant Maintenance Desktop App",
+                "segment": "Operations & Manufacturing",
+                "gross": 1.20,
+                "dc": 4,
+                "tf": 2,
+                "dr": 2,
+                "der": 3,
+                "er": 2,
+                "strategy": "Re-platform",
+                "findings": [
+                    "Legacy OS dependency (Win7)",
+                    "Critical for shift handover",
+                    "High latency issues",
+                ],
+            },
+        ]
+
+        for app_row in app_seed:
+            segment_id = cur.execute(
+                "SELECT id FROM segments WHERE name = ?", (app_row["segment"],)
+            ).fetchone()[0]
+
+            cur.execute(
+                """
+                INSERT OR REPLACE INTO apps (id, name, segment_id, gross, dc, tf, dr, der, er, strategy)
+                VALUES (:id, :name, :segment_id, :gross, :dc, :tf, :dr, :der, :er, :strategy)
+                """,
+                {
+                    **app_row,
+                    "segment_id": segment_id,
+                },
+            )
+
+            cur.execute("DELETE FROM app_findings WHERE app_id = ?", (app_row["id"],))
+            cur.executemany(
+                "INSERT INTO app_findings (app_id, detail) VALUES (?, ?)",
+                [(app_row["id"], finding) for finding in app_row["findings"]],
+            )
+
+        if cur.execute("SELECT COUNT(1) FROM governance_raci").fetchone()[0] == 0:
+            cur.executemany(
+                "INSERT INTO governance_raci (task, ddo, it, board) VALUES (?, ?, ?, ?)",
+                [
+                    ("Scope Decision", "X", "Y", "Y"),
+                    ("Savings Approval", "X", "Y", "X"),
+                    ("Data Quality Sign-off", "Y", "X", "Y"),
+                    ("Phase-Gate Readiness", "Y", "Y", "X"),
+                ],
+            )
+
+        if cur.execute("SELECT COUNT(1) FROM governance_gates").fetchone()[0] == 0:
+            cur.executemany(
+                "INSERT INTO governance_gates (gate) VALUES (?)",
+                [
+                    ("Minimum data completeness threshold met",),
+                    ("Cost allocation logic agreed",),
+                    ("Stakeholder alignment workshops completed",),
+                    ("Target Architecture 2030 alignment baseline established",),
+                ],
+            )
+
+        if cur.execute("SELECT COUNT(1) FROM change_plan").fetchone()[0] == 0:
+            cur.executemany(
+                "INSERT INTO change_plan (week, title, desc) VALUES (?, ?, ?)",
+                [
+                    ("W1", "Mobilization", "Kickoff & Success Criteria"),
+                    ("W2", "Standards", "Arch Alignment & Guardrails"),
+                    ("W3", "Readiness", "Segment Onboarding"),
+                    ("W4", "Go-Live", "Sprint 0 & Dashboard Validation"),
+                ],
+            )
+
+        if cur.execute("SELECT COUNT(1) FROM stakeholders").fetchone()[0] == 0:
+            cur.executemany(
+                "INSERT INTO stakeholders (name, impact, focus, strategy) VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        "Board of Directors",
+                        "High",
+                        "Strategic Oversight",
+                        "Executive readouts & portfolio steering",
+                    ),
+                    (
+                        "DDO & Architecture",
+                        "Critical",
+                        "Future Readiness",
+                        "Architecture alignment workshops",
+                    ),
+                    (
+                        "Information Managers",
+                        "Critical",
+                        "Data Integrity",
+                        "Process stewardship & validation",
+                    ),
+                ],
+            )
+
+        conn.commit()
+
+
+def portfolio_simulation() -> Dict:
+    """Portfolio, governance and change-management payload for /api/v1/portfolio"""
+    with closing(get_connection()) as conn:
+        cur = conn.cursor()
+
+        segments = cur.execute("SELECT id, name FROM segments ORDER BY id").fetchall()
+        portfolio: List[Dict] = []
+
+        for seg in segments:
+            apps_for_segment = cur.execute(
+                "SELECT * FROM apps WHERE segment_id = ? ORDER BY id", (seg["id"],)
+            ).fetchall()
+
+            app_payload = []
+            for app_row in apps_for_segment:
+                findings = [
+                    row["detail"]
+                    for row in cur.execute(
+                        "SELECT detail FROM app_findings WHERE app_id = ? ORDER BY id",
+                        (app_row["id"],),
+                    ).fetchall()
+                ]
+
+                confidence, band, weighted = calculate_confidence(
+                    AppMetrics(
+                        dc=app_row["dc"],
+                        tf=app_row["tf"],
+                        dr=app_row["dr"],
+                        der=app_row["der"],
+                        er=app_row["er"],
+                        gross=app_row["gross"],
+                    )
+                )
+
+                app_payload.append(
+                    {
+                        "id": app_row["id"],
+                        "name": app_row["name"],
+                        "gross": app_row["gross"],
+                        "dc": app_row["dc"],
+                        "tf": app_row["tf"],
+                        "dr": app_row["dr"],
+                        "der": app_row["der"],
+                        "er": app_row["er"],
+                        "strategy": app_row["strategy"],
+                        "findings": findings,
+                        "confidence": confidence,
+                        "band": band,
+                        "weighted": weighted,
+                    }
+                )
+
+            portfolio.append(
+                {
+                    "segment": seg["name"],
+                    "apps": app_payload,
+                    "total_weighted": round(sum(app["weighted"] for app in app_payload), 2),
+                }
+            )
+
+        governance = {
+            "raci": [
+                {
+                    "task": row["task"],
+                    "ddo": row["ddo"],
+                    "it": row["it"],
+                    "board": row["board"],
+                }
+                for row in cur.execute("SELECT task, ddo, it, board FROM governance_raci ORDER BY id")
+            ],
+            "gates": [row["gate"] for row in cur.execute("SELECT gate FROM governance_gates ORDER BY id")],
+        }
+
+        change_management = {
+            "comms_plan": [
+                {
+                    "week": row["week"],
+                    "title": row["title"],
+                    "desc": row["desc"],
+                }
+                for row in cur.execute("SELECT week, title, desc FROM change_plan ORDER BY id")
+            ],
+            "stakeholders": [
+                {
+                    "name": row["name"],
+                    "impact": row["impact"],
+                    "focus": row["focus"],
+                    "strategy": row["strategy"],
+                }
+                for row in cur.execute(
+                    "SELECT name, impact, focus, strategy FROM stakeholders ORDER BY id"
+                )
+            ],
+        }
+
+        return {"portfolio": portfolio, "governance": governance, "change_management": change_management}
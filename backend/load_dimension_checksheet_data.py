@@ -4,14 +4,11 @@ Each dimension column in the Excel has its own set of maturity level items
 """
 import os
 import pandas as pd
-from sqlalchemy.orm import Session
 from database import SessionLocal, MaturityLevel, Dimension
-
-def clear_existing_data(db: Session):
-    """Clear existing maturity levels"""
-    db.query(MaturityLevel).delete()
-    db.commit()
-    print("Cleared existing maturity levels")
+from bulk_load import bulk_session
+from table_sync import sync_table
+from reference_cache import bump_generation, MATURITY_LEVELS
+from workbook_cache import read_sheet
 
 def load_dimension_specific_checksheet():
     """
@@ -29,16 +26,11 @@ def load_dimension_specific_checksheet():
     print(f"Reading Excel file: {excel_path}")
     
     # Read the Excel sheet without headers
-    df = pd.read_excel(excel_path, sheet_name='Smart Factory CheckSheet', header=None)
+    df = read_sheet(excel_path, 'Smart Factory CheckSheet')
     
     print(f"Excel shape: {df.shape}")
     
-    db = SessionLocal()
-    
     try:
-        # Clear existing data
-        clear_existing_data(db)
-        
         # Get dimension names from row 2 (index 2), columns 2-9
         dimension_row = df.iloc[2]
         dimension_columns = {}  # Map column index to dimension name
@@ -49,18 +41,23 @@ def load_dimension_specific_checksheet():
                 dimension_columns[col_idx] = dim_name
                 print(f"Column {col_idx}: {dim_name}")
         
-        # Get dimension objects from database
+        # Get dimension ids from database, first match per name
+        with SessionLocal() as db:
+            found = {}
+            for dimension_id, name in db.query(Dimension.id, Dimension.name).filter(
+                Dimension.name.in_(dimension_columns.values())
+            ).order_by(Dimension.id):
+                found.setdefault(name, dimension_id)
         dimension_map = {}  # Map dimension name to dimension ID
         for dim_name in dimension_columns.values():
-            dimension = db.query(Dimension).filter(Dimension.name == dim_name).first()
-            if dimension:
-                dimension_map[dim_name] = dimension.id
-                print(f"Mapped '{dim_name}' to dimension ID {dimension.id}")
+            if dim_name in found:
+                dimension_map[dim_name] = found[dim_name]
+                print(f"Mapped '{dim_name}' to dimension ID {found[dim_name]}")
             else:
                 print(f"WARNING: Dimension '{dim_name}' not found in database")
         
         # Parse each dimension column
-        loaded_count = 0
+        rows = []
         
         for col_idx, dim_name in dimension_columns.items():
             if dim_name not in dimension_map:
@@ -111,33 +108,32 @@ def load_dimension_specific_checksheet():
                 # This is an actual item (e.g., "1.1a", "1.1b")
                 if sub_level_val and current_level and current_category:
                     # Create the maturity level entry
-                    maturity_level = MaturityLevel(
-                        dimension_id=dimension_id,
-                        level=current_level,
-                        name=current_level_name,
-                        sub_level=sub_level_val,
-                        category=current_category,
-                        description=description
-                    )
-                    db.add(maturity_level)
-                    loaded_count += 1
+                    rows.append({
+                        "dimension_id": dimension_id,
+                        "level": current_level,
+                        "name": current_level_name,
+                        "sub_level": sub_level_val,
+                        "category": current_category,
+                        "description": description
+                    })
                     print(f"      Added {sub_level_val}: {description[:50]}...")
         
-        db.commit()
-        print(f"\n✓ Successfully loaded {loaded_count} maturity level items across {len(dimension_map)} dimensions")
+        # Sync the maturity levels to these rows in one transaction
+        with bulk_session() as (db, loader):
+            sync_table(db, MaturityLevel, rows, loader)
+        bump_generation(MATURITY_LEVELS)
+        print(f"\n✓ Successfully loaded {len(rows)} maturity level items across {len(dimension_map)} dimensions")
+        print(loader.summary())
         
         # Show summary by dimension
         for dim_name, dim_id in dimension_map.items():
-            count = db.query(MaturityLevel).filter(MaturityLevel.dimension_id == dim_id).count()
+            count = sum(1 for row in rows if row["dimension_id"] == dim_id)
             print(f"  {dim_name}: {count} items")
         
     except Exception as e:
-        db.rollback()
         print(f"Error loading data: {str(e)}")
         import traceback
         traceback.print_exc()
-    finally:
-        db.close()
 
 if __name__ == "__main__":
     load_dimension_specific_checksheet()
@@ -5,7 +5,53 @@ import os
 import pandas as pd
 import random
 from sqlalchemy.orm import Session
-from database import SessionLocal, Area, Dimension
+from database import Area, Dimension
+from bulk_load import BulkLoader, bulk_session
+from table_sync import sync_table
+from area_summary import refresh_area_summaries
+from reference_cache import bump_generation, AREAS
+from workbook_cache import read_sheet
+from checksheet_parser import parse_report_frame, report_areas
+
+REPORTS_WORKBOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'MM_Data.xlsx')
+
+def parse_report_areas(excel_path=REPORTS_WORKBOOK_PATH):
+    """
+    Parse the Reports sheet into [{"name", "desired_level", "dimensions": [names]}].
+    An area header row names the area in column 0 (target level in column 8) and may carry
+    the area's first dimension in column 1; following rows list further dimensions.
+    No database access, so it can run in a worker process.
+    """
+    return report_areas(parse_report_frame(read_sheet(excel_path, 'Reports')))
+
+def apply_report_areas(db: Session, areas, loader: BulkLoader = None):
+    """
+    Sync areas and dimensions to the parsed ones, simulating each dimension's current level
+    around its area's target. Returns (area_count, dimension_count); the caller commits.
+    """
+    loader = loader or BulkLoader(db)
+    # Areas first, for the ids their dimensions point at
+    area_ids = sync_table(db, Area, [
+        {
+            "name": parsed["name"],
+            "description": f"{parsed['name']} Digital Maturity Assessment",
+            "desired_level": parsed["desired_level"],
+        }
+        for parsed in areas
+    ], loader).ids
+    dimensions = [
+        {
+            "name": name,
+            "area_id": area_id,
+            "current_level": random.randint(max(1, parsed["desired_level"] - 2), min(parsed["desired_level"] + 1, 5)),
+            "desired_level": parsed["desired_level"],
+        }
+        for parsed, area_id in zip(areas, area_ids)
+        for name in parsed["dimensions"]
+    ]
+    sync_table(db, Dimension, dimensions, loader)
+    refresh_area_summaries(db)
+    return len(areas), len(dimensions)
 
 def load_reports_simulated_data():
     """Load Reports sheet data with unique dimensions (no duplicates)"""
@@ -17,31 +63,13 @@ def load_reports_simulated_data():
     print(f"Reading Excel file: {excel_path}")
     
     # Read the Reports sheet
-    df = pd.read_excel(excel_path, sheet_name='Reports', header=None)
+    df = read_sheet(excel_path, 'Reports')
     
     print(f"Excel shape: {df.shape}")
     
-    db = SessionLocal()
-    
     try:
-        # Clear existing dimensions and areas
-        db.query(Dimension).delete()
-        db.query(Area).delete()
-        db.commit()
-        print("Cleared existing areas and dimensions\n")
-        
-        # Create a default "Operations Excellence" area
-        default_area = Area(
-            name="Operations Excellence",
-            description="Smart Factory Digital Maturity Assessment",
-            desired_level=3
-        )
-        db.add(default_area)
-        db.flush()
-        print(f"Created default area: {default_area.name}\n")
-        
         dimension_names = set()  # Track unique dimension names
-        dimension_count = 0
+        dimensions = []
         
         # Parse the data to extract unique dimension names
         for idx, row in df.iterrows():
@@ -61,29 +89,32 @@ def load_reports_simulated_data():
                     # Create dimension with random current level for simulation
                     current_level = random.randint(1, 3)
                     desired_level = random.randint(3, 4)
-                    
-                    dimension = Dimension(
-                        name=dimension_name,
-                        area_id=default_area.id,
-                        current_level=current_level,
-                        desired_level=desired_level
-                    )
-                    db.add(dimension)
-                    dimension_count += 1
+                    dimensions.append({
+                        "name": dimension_name,
+                        "current_level": current_level,
+                        "desired_level": desired_level
+                    })
                     print(f"✓ Added dimension: {dimension_name} (Current: {current_level}, Desired: {desired_level})")
         
-        db.commit()
-        print(f"\n✅ Successfully loaded {dimension_count} unique dimensions")
-        return dimension_count
+        with bulk_session() as (db, loader):
+            # A single default "Operations Excellence" area holds every dimension
+            [default_area_id] = sync_table(db, Area, [{
+                "name": "Operations Excellence",
+                "description": "Smart Factory Digital Maturity Assessment",
+                "desired_level": 3
+            }], loader).ids
+            sync_table(db, Dimension, [dict(dimension, area_id=default_area_id) for dimension in dimensions], loader)
+            refresh_area_summaries(db)
+        bump_generation(AREAS)
+        print(f"\n✅ Successfully loaded {len(dimensions)} unique dimensions")
+        print(loader.summary())
+        return len(dimensions)
         
     except Exception as e:
         print(f"❌ Error loading reports data: {e}")
         import traceback
         traceback.print_exc()
-        db.rollback()
         raise
-    finally:
-        db.close()
 
 if __name__ == "__main__":
     load_reports_simulated_data()
@@ -3,14 +3,11 @@ Load simulated data from Smart Factory CheckSheet Excel into database
 """
 import os
 import pandas as pd
-from sqlalchemy.orm import Session
-from database import engine, MaturityLevel, RatingScale, SessionLocal
-
-def clear_existing_data(db: Session):
-    """Clear existing maturity levels"""
-    db.query(MaturityLevel).delete()
-    db.commit()
-    print("Cleared existing maturity levels")
+from database import MaturityLevel
+from bulk_load import bulk_session
+from table_sync import sync_table
+from reference_cache import bump_generation, MATURITY_LEVELS
+from workbook_cache import read_sheet
 
 def load_smart_factory_data():
     """Load Smart Factory CheckSheet data from Excel"""
@@ -22,16 +19,11 @@ def load_smart_factory_data():
     print(f"Reading Excel file: {excel_path}")
     
     # Read the Excel sheet
-    df = pd.read_excel(excel_path, sheet_name='Smart Factory CheckSheet', header=None)
+    df = read_sheet(excel_path, 'Smart Factory CheckSheet')
     
     print(f"Excel shape: {df.shape}")
     
-    db = SessionLocal()
-    
     try:
-        # Clear existing data
-        clear_existing_data(db)
-        
         # Parse the data structure
         # Row 3 has column headers (dimensions)
         # Rows 4+ have level headers and capabilities
@@ -39,7 +31,7 @@ def load_smart_factory_data():
         current_level = None
         current_level_name = None
         
-        loaded_count = 0
+        rows = []
         
         for idx, row in df.iterrows():
             if idx < 3:  # Skip header rows
@@ -93,27 +85,26 @@ def load_smart_factory_data():
                         break
                 
                 if current_level and description:
-                    maturity_level = MaturityLevel(
-                        level=current_level,
-                        name=current_level_name or f"Level {current_level}",
-                        sub_level=sub_level,
-                        category=category,
-                        description=description.strip()
-                    )
-                    db.add(maturity_level)
-                    loaded_count += 1
+                    rows.append({
+                        "level": current_level,
+                        "name": current_level_name or f"Level {current_level}",
+                        "sub_level": sub_level,
+                        "category": category,
+                        "description": description.strip()
+                    })
                     print(f"  Added: {sub_level} - {category} - {description[:50]}...")
         
-        db.commit()
-        print(f"\n✅ Successfully loaded {loaded_count} maturity level items")
-        return loaded_count
+        # Sync the maturity levels to these rows in one transaction
+        with bulk_session() as (db, loader):
+            sync_table(db, MaturityLevel, rows, loader)
+        bump_generation(MATURITY_LEVELS)
+        print(f"\n✅ Successfully loaded {len(rows)} maturity level items")
+        print(loader.summary())
+        return len(rows)
         
     except Exception as e:
         print(f"Error loading data: {e}")
-        db.rollback()
         raise
-    finally:
-        db.close()
 
 if __name__ == "__main__":
     load_smart_factory_data()
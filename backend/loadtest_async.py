@@ -0,0 +1,127 @@
+"""
+Load test: sync vs async database stack for the hot /api/mm read endpoints
+Starts uvicorn twice on a copy of the database - once with MM_DB_ASYNC=0 and once with
+MM_DB_ASYNC=1 - and drives each with 200 concurrent clients, reporting requests per second.
+Pass --url to hit an already running server instead (one run, whatever stack it uses).
+
+Requires httpx (pip install httpx); the async run also needs
+aiosqlite and greenlet (pip install -r requirements-async.txt).
+
+Usage:
+    python loadtest_async.py [--clients 200] [--duration 15] [--source manufacturing.db]
+    python loadtest_async.py --url http://localhost:8000
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ENDPOINTS = [
+    "/api/mm/areas",
+    "/api/mm/maturity-levels",
+    "/api/mm/rating-scales",
+    "/api/mm/reports/summary",
+    "/api/mm/checksheet-selections/1",
+]
+
+
+async def client_loop(client, base_url, deadline, counts, latencies, offset):
+    i = offset
+    while time.perf_counter() < deadline:
+        path = ENDPOINTS[i % len(ENDPOINTS)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            response = await client.get(base_url + path)
+            ok = response.status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        latencies.append(time.perf_counter() - start)
+        counts["ok" if ok else "failed"] += 1
+
+
+async def drive(base_url, clients, duration):
+    counts = {"ok": 0, "failed": 0}
+    latencies = []
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            client_loop(client, base_url, deadline, counts, latencies, offset)
+            for offset in range(clients)
+        ])
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] if latencies else 0
+    p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0
+    return counts, elapsed, p50, p95
+
+
+def report(label, counts, elapsed, p50, p95):
+    rps = counts["ok"] / elapsed
+    print(f"{label:>6}: {rps:8.1f} req/s  p50 {p50 * 1000:7.1f} ms  p95 {p95 * 1000:7.1f} ms  "
+          f"({counts['ok']} ok, {counts['failed']} failed)")
+    return rps
+
+
+def wait_until_up(server, base_url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            if httpx.get(base_url + "/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+def run_server(label, async_db, source, port, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copyfile(source, os.path.join(tmp, "manufacturing.db"))
+        env = dict(os.environ, MM_DB_ASYNC="1" if async_db else "0", PYTHONPATH=BACKEND_DIR)
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=tmp, env=env
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            wait_until_up(server, base_url)
+            return report(label, *asyncio.run(drive(base_url, args.clients, args.duration)))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per run")
+    parser.add_argument("--source", default=os.path.join(BACKEND_DIR, "manufacturing.db"))
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--url", help="test a running server instead of starting one")
+    args = parser.parse_args()
+
+    print(f"{args.clients} concurrent clients, {args.duration:.0f}s per run\n")
+    if args.url:
+        report("server", *asyncio.run(drive(args.url.rstrip("/"), args.clients, args.duration)))
+        return
+
+    sync_rps = run_server("sync", False, args.source, args.port, args)
+    async_rps = run_server("async", True, args.source, args.port, args)
+    print(f"\nasync / sync throughput: {async_rps / sync_rps:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
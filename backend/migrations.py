@@ -0,0 +1,179 @@
+"""
+Minimal in-repo schema migrations for the SQLite database
+Base.metadata.create_all only creates missing tables, so columns and indexes added to
+existing tables are applied here. Each migration runs once, in its own transaction, and is
+recorded in schema_migrations. Migrations must be idempotent: a fresh database already has
+everything create_all builds from the models, and the steps then only record themselves.
+
+Usage:
+    python migrations.py [--source manufacturing.db]     # apply pending migrations
+    python migrations.py --status
+"""
+import argparse
+import re
+from datetime import datetime
+
+from sqlalchemy import create_engine, text
+
+from naming import normalize_dimension_name
+
+
+def _keep_latest(conn, table, columns):
+    """Delete all but the newest row of each duplicate key so a unique index can be built"""
+    key = ", ".join(columns)
+    not_null = " AND ".join(f"{column} IS NOT NULL" for column in columns)
+    conn.execute(text(f"""
+        DELETE FROM {table}
+        WHERE {not_null}
+          AND id NOT IN (SELECT MAX(id) FROM {table} WHERE {not_null} GROUP BY {key})
+    """))
+
+
+def _create_index(conn, name, table, columns, unique=False):
+    conn.execute(text(
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+    ))
+
+
+def unique_checksheet_selections(conn):
+    _keep_latest(conn, "checksheet_selections", ["assessment_id", "maturity_level_id"])
+    _create_index(conn, "uq_checksheet_selection_assessment_level", "checksheet_selections",
+                  ["assessment_id", "maturity_level_id"], unique=True)
+
+
+def rating_scale_normalized_names(conn):
+    columns = {row[1] for row in conn.execute(text("PRAGMA table_info(rating_scales)"))}
+    if "normalized_name" not in columns:
+        conn.execute(text("ALTER TABLE rating_scales ADD COLUMN normalized_name VARCHAR"))
+    _create_index(conn, "ix_rating_scales_normalized_name", "rating_scales", ["normalized_name"])
+    missing = conn.execute(text("SELECT id, dimension_name FROM rating_scales WHERE normalized_name IS NULL")).all()
+    if missing:
+        conn.execute(
+            text("UPDATE rating_scales SET normalized_name = :normalized_name WHERE id = :id"),
+            [{"id": row_id, "normalized_name": normalize_dimension_name(name)} for row_id, name in missing]
+        )
+
+
+def hot_query_indexes(conn):
+    _keep_latest(conn, "dimension_assessments", ["assessment_id", "dimension_id"])
+    _create_index(conn, "uq_dimension_assessment_assessment_dimension", "dimension_assessments",
+                  ["assessment_id", "dimension_id"], unique=True)
+    _create_index(conn, "ix_checksheet_selections_assessment_selected", "checksheet_selections",
+                  ["assessment_id", "is_selected"])
+    _create_index(conn, "ix_maturity_levels_dimension_level_sub_level", "maturity_levels",
+                  ["dimension_id", "level", "sub_level"])
+    _create_index(conn, "ix_dimensions_area_id", "dimensions", ["area_id"])
+    _create_index(conn, "ix_assessments_created_at", "assessments", ["created_at"])
+
+
+def assessment_filter_indexes(conn):
+    _create_index(conn, "ix_assessments_plant_created", "assessments", ["plant_name", "created_at"])
+    _create_index(conn, "ix_assessments_shop_unit_created", "assessments", ["shop_unit", "created_at"])
+
+
+def adopt_loaded_datasets(conn):
+    """
+    A database populated before data_manifest existed: record its reference data as loaded,
+    sources unknown, so startup keeps it as the old table counts did instead of reloading it
+    """
+    if conn.execute(text("SELECT 1 FROM data_manifest LIMIT 1")).first():
+        return
+    tables = ["areas", "dimensions", "maturity_levels", "rating_scales"]
+    if not all(conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {table})")).scalar() for table in tables):
+        return
+    conn.execute(
+        text("INSERT INTO data_manifest (name, version, source_hash, loaded_at) VALUES (:name, NULL, NULL, :now)"),
+        [{"name": name, "now": datetime.utcnow()} for name in ("seed", "maturity_levels", "rating_scales", "reports")]
+    )
+
+
+def assessments_created_at_not_null(conn):
+    """
+    Backfill assessments.created_at (assessment date, else last update, else now) and make it
+    NOT NULL: it is the cursor-pagination key, and a NULL row can be neither encoded in a cursor
+    nor reached past one. SQLite cannot alter a column's constraints, so the table is rebuilt
+    from its own definition and its indexes recreated.
+    """
+    conn.execute(
+        text("UPDATE assessments SET created_at = COALESCE(assessment_date, updated_at, :now) WHERE created_at IS NULL"),
+        {"now": datetime.utcnow()}
+    )
+    table_sql = conn.execute(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'assessments'")).scalar()
+    rebuilt_sql, changed = re.subn(r"\bcreated_at DATETIME\b(?! NOT NULL)", "created_at DATETIME NOT NULL", table_sql)
+    if not changed:
+        return
+    index_sql = conn.execute(text(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'assessments' AND sql IS NOT NULL"
+    )).scalars().all()
+    conn.execute(text(re.sub(r"^CREATE TABLE \"?assessments\"?", "CREATE TABLE assessments_rebuild", rebuilt_sql)))
+    conn.execute(text("INSERT INTO assessments_rebuild SELECT * FROM assessments"))
+    conn.execute(text("DROP TABLE assessments"))
+    conn.execute(text("ALTER TABLE assessments_rebuild RENAME TO assessments"))
+    for sql in index_sql:
+        conn.execute(text(sql))
+
+
+# (version, name, step) - append only; never renumber or edit an applied step
+MIGRATIONS = [
+    (1, "unique_checksheet_selections", unique_checksheet_selections),
+    (2, "rating_scale_normalized_names", rating_scale_normalized_names),
+    (3, "hot_query_indexes", hot_query_indexes),
+    (4, "assessment_filter_indexes", assessment_filter_indexes),
+    (5, "adopt_loaded_datasets", adopt_loaded_datasets),
+    (6, "assessments_created_at_not_null", assessments_created_at_not_null),
+]
+
+
+def _ensure_table(db_engine):
+    with db_engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations "
+            "(version INTEGER PRIMARY KEY, name VARCHAR NOT NULL, applied_at DATETIME NOT NULL)"
+        ))
+
+
+def applied_versions(db_engine):
+    _ensure_table(db_engine)
+    with db_engine.connect() as conn:
+        return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def run_migrations(db_engine):
+    """Apply pending migrations in order; returns the names applied"""
+    applied = applied_versions(db_engine)
+    names = []
+    for version, name, step in MIGRATIONS:
+        if version in applied:
+            continue
+        with db_engine.begin() as conn:
+            step(conn)
+            # OR IGNORE: another process may have applied the same (idempotent) step meanwhile
+            conn.execute(
+                text("INSERT OR IGNORE INTO schema_migrations (version, name, applied_at) VALUES (:version, :name, :now)"),
+                {"version": version, "name": name, "now": datetime.utcnow()}
+            )
+        names.append(name)
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default="manufacturing.db")
+    parser.add_argument("--status", action="store_true", help="list migrations without applying them")
+    args = parser.parse_args()
+
+    db_engine = create_engine(f"sqlite:///{args.source}")
+    if args.status:
+        applied = applied_versions(db_engine)
+        for version, name, _ in MIGRATIONS:
+            print(f"{version:04d} {name:35} {'applied' if version in applied else 'pending'}")
+    else:
+        from database import Base
+        Base.metadata.create_all(bind=db_engine)
+        names = run_migrations(db_engine)
+        print(f"Applied {len(names)} migration(s){': ' + ', '.join(names) if names else ''}")
+    db_engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+In-memory prefix/token index over normalized dimension names
+Backs the fuzzy fallback of GET /api/mm/rating-scales/{dimension_name}: exact names are
+looked up through the indexed rating_scales.normalized_name column, partial ones through
+sorted name/token lists (binary search for prefixes) and a token -> names map, plus a linear
+substring pass over the distinct names, so the results include everything LIKE '%...%' found.
+Matches are ranked by quality instead of coming back in table order.
+"""
+import bisect
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database import RatingScale
+from naming import normalize_dimension_name
+from reference_cache import reference_cache, DEFAULT_TTL_SECONDS, RATING_SCALES
+
+# Match quality, best first
+EXACT, NAME_PREFIX, ALL_TOKENS, TOKEN_PREFIXES, SUBSTRING = range(5)
+
+
+def _prefixed(sorted_values: List[str], prefix: str) -> List[str]:
+    """Values starting with prefix, found by binary search in a sorted list"""
+    start = bisect.bisect_left(sorted_values, prefix)
+    end = bisect.bisect_left(sorted_values, prefix + "\uffff")
+    return sorted_values[start:end]
+
+
+class NameIndex:
+    def __init__(self, names: Iterable[str]):
+        self.names = sorted({name for name in names if name})
+        self._name_set = set(self.names)
+        self._tokens: Dict[str, Set[str]] = defaultdict(set)
+        for name in self.names:
+            for token in name.split():
+                self._tokens[token].add(name)
+        self._sorted_tokens = sorted(self._tokens)
+
+    def _names_with_token_prefix(self, prefix: str) -> Set[str]:
+        matches = set()
+        for token in _prefixed(self._sorted_tokens, prefix):
+            matches |= self._tokens[token]
+        return matches
+
+    def search(self, query: str) -> List[str]:
+        """Names matching query (normalized on the way in), best match first"""
+        query = normalize_dimension_name(query)
+        if not query:
+            return []
+        tokens = query.split()
+        ranks = {}
+
+        def rank(names, quality):
+            for name in names:
+                ranks.setdefault(name, quality)
+
+        rank([query] if query in self._name_set else [], EXACT)
+        rank(_prefixed(self.names, query), NAME_PREFIX)
+        rank(set.intersection(*(self._tokens.get(token, set()) for token in tokens)), ALL_TOKENS)
+        rank(set.intersection(*(self._names_with_token_prefix(token) for token in tokens)), TOKEN_PREFIXES)
+        # Always, so every name the old LIKE '%...%' returned is still there, ranked after the rest
+        rank([name for name in self.names if query in name], SUBSTRING)
+
+        # Within a tier, the name with the fewest extra characters is the closer match
+        return sorted(ranks, key=lambda name: (ranks[name], len(name), name))
+
+
+_lock = threading.Lock()
+_cached = {"generation": None, "built_at": 0.0, "index": None}
+
+
+def rating_scale_name_index(db: Session) -> NameIndex:
+    """Index over rating_scales.normalized_name, rebuilt when the rating scales are reloaded"""
+    generation = reference_cache.generation(RATING_SCALES)
+    with _lock:
+        fresh = time.monotonic() - _cached["built_at"] < DEFAULT_TTL_SECONDS
+        if _cached["index"] is not None and _cached["generation"] == generation and fresh:
+            return _cached["index"]
+    names = db.execute(select(RatingScale.normalized_name).distinct()).scalars().all()
+    index = NameIndex(names)
+    with _lock:
+        _cached.update(generation=generation, built_at=time.monotonic(), index=index)
+    return index
@@ -0,0 +1,10 @@
+"""
+Name normalization shared by the API and the scoring/loader modules
+"""
+
+
+def normalize_dimension_name(value: str) -> str:
+    """Case-insensitive normalization that aligns '&' with 'and'."""
+    if not value:
+        return ""
+    return " ".join(value.lower().replace("&", "and").split())
@@ -0,0 +1,39 @@
+"""
+Keyset (cursor) pagination helpers
+A cursor is an opaque, URL-safe token holding the sort key of the last row of a page.
+The next page continues strictly after that key, so the cost of a page does not grow with
+its position the way OFFSET does.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import tuple_
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(payload)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+
+def after_cursor_desc(created_column, id_column, cursor: Optional[str]):
+    """Filter for rows after the cursor in (created_at DESC, id DESC) order, or None"""
+    if not cursor:
+        return None
+    created_at, row_id = decode_cursor(cursor)
+    # Row-value comparison, so SQLite can seek an index on (created_at[, rowid]) instead of scanning
+    return tuple_(created_column, id_column) < tuple_(created_at, row_id)
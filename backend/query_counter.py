@@ -0,0 +1,39 @@
+"""
+SQL statement counting for endpoint query budgets
+Usage:
+    with count_queries(engine) as counter:
+        client.get("/api/mm/areas")
+    assert counter.count <= 2, counter.statements
+"""
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from database import engine as default_engine
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements = []
+        self.executions = []  # (statement, parameters, executemany)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+@contextmanager
+def count_queries(db_engine=None):
+    """Record every SQL statement executed on the engine while the block runs"""
+    db_engine = db_engine or default_engine
+    counter = QueryCounter()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counter.statements.append(statement)
+        counter.executions.append((statement, parameters, executemany))
+
+    event.listen(db_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(db_engine, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,184 @@
+"""
+In-process read-through cache for reference data (rating scales, maturity levels, areas)
+Responses are held as pre-serialized JSON bytes in a size-bounded LRU with a TTL. Every entry
+is stamped with the generation of its scope; loaders and refresh endpoints call
+bump_generation() after committing, which makes older entries unreachable at once. The TTL
+bounds staleness for writes made by another process (a second worker or a CLI loader).
+Each body carries a strong ETag (a hash of its bytes), so clients revalidating with
+If-None-Match get a 304 without a database hit while the entry is cached.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Annotated, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+from fastapi import Header, Response
+from fastapi.encoders import jsonable_encoder
+
+RATING_SCALES = "rating_scales"
+MATURITY_LEVELS = "maturity_levels"
+AREAS = "areas"  # areas and their dimensions
+SCOPES = (RATING_SCALES, MATURITY_LEVELS, AREAS)
+
+# Endpoint parameter for the conditional GET header; a plain None default keeps direct calls working
+IfNoneMatch = Annotated[Optional[str], Header()]
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get("MM_CACHE_MAX_ENTRIES", "512"))
+DEFAULT_MAX_BYTES = int(os.environ.get("MM_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+DEFAULT_TTL_SECONDS = float(os.environ.get("MM_CACHE_TTL_SECONDS", "300"))
+
+
+def serialize(content) -> bytes:
+    """Encode a response the same way FastAPI's JSONResponse does"""
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class CachedBody(NamedTuple):
+    body: bytes
+    etag: str
+
+    @classmethod
+    def build(cls, content) -> "CachedBody":
+        body = serialize(content)
+        return cls(body, '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"')
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison: W/ prefixes are ignored and "*" matches anything"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (candidate[2:] if candidate.startswith("W/") else candidate for candidate in candidates)
+
+
+class ReferenceCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple, Tuple[int, float, CachedBody]]" = OrderedDict()
+        self._generations: Dict[str, int] = dict.fromkeys(SCOPES, 0)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(("hits", "misses", "stores", "evictions", "expirations", "invalidations"), 0)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def generation(self, scope: str) -> int:
+        with self._lock:
+            return self._generations.get(scope, 0)
+
+    def lookup(self, scope: str, key: Hashable) -> Tuple[Optional[CachedBody], int]:
+        """Cached body (or None) plus the scope generation to pass to store() on a miss"""
+        with self._lock:
+            generation = self._generations.get(scope, 0)
+            entry = self._entries.get((scope, key))
+            if entry is not None:
+                entry_generation, expires_at, cached = entry
+                if entry_generation == generation and expires_at > time.monotonic():
+                    self._entries.move_to_end((scope, key))
+                    self._stats["hits"] += 1
+                    return cached, generation
+                self._drop((scope, key))
+                self._stats["expirations" if entry_generation == generation else "invalidations"] += 1
+            self._stats["misses"] += 1
+            return None, generation
+
+    def store(self, scope: str, key: Hashable, cached: CachedBody, generation: int) -> None:
+        """Cache a body built under `generation`; dropped if a refresh bumped the scope meanwhile"""
+        if not self.enabled or len(cached.body) > self.max_bytes:
+            return
+        with self._lock:
+            if self._generations.get(scope, 0) != generation:
+                return
+            if (scope, key) in self._entries:
+                self._drop((scope, key))
+            self._entries[(scope, key)] = (generation, time.monotonic() + self.ttl_seconds, cached)
+            self._bytes += len(cached.body)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def get_or_build(self, scope: str, key: Hashable, build: Callable[[], object]) -> CachedBody:
+        """Serialized response for key, calling build() for the content on a miss"""
+        cached, generation = self.lookup(scope, key)
+        if cached is None:
+            cached = CachedBody.build(build())
+            self.store(scope, key, cached, generation)
+        return cached
+
+    async def get_or_build_async(self, scope: str, key: Hashable, build: Callable[[], Awaitable[object]]) -> CachedBody:
+        cached, generation = self.lookup(scope, key)
+        if cached is None:
+            cached = CachedBody.build(await build())
+            self.store(scope, key, cached, generation)
+        return cached
+
+    def bump(self, *scopes: str) -> None:
+        """Invalidate everything cached for the given scopes (all scopes when none given)"""
+        with self._lock:
+            for scope in scopes or tuple(self._generations):
+                self._generations[scope] = self._generations.get(scope, 0) + 1
+                for cache_key in [cache_key for cache_key in self._entries if cache_key[0] == scope]:
+                    self._drop(cache_key)
+                    self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_ratio": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "generations": dict(self._generations),
+            }
+
+    def _drop(self, cache_key: Tuple) -> None:
+        _, _, cached = self._entries.pop(cache_key)
+        self._bytes -= len(cached.body)
+
+
+reference_cache = ReferenceCache()
+
+
+def bump_generation(*scopes: str) -> None:
+    """Call after committing a change to reference data"""
+    reference_cache.bump(*scopes)
+
+
+def conditional_response(cached: CachedBody, if_none_match: Optional[str] = None) -> Response:
+    """200 with the body, or an empty 304 when the client already holds this ETag"""
+    # no-cache: clients may keep the body but must revalidate it on every use
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+def cached_response(
+    scope: str, key: Hashable, build: Callable[[], object], if_none_match: Optional[str] = None
+) -> Response:
+    return conditional_response(reference_cache.get_or_build(scope, key, build), if_none_match)
+
+
+async def cached_response_async(
+    scope: str, key: Hashable, build: Callable[[], Awaitable[object]], if_none_match: Optional[str] = None
+) -> Response:
+    return conditional_response(await reference_cache.get_or_build_async(scope, key, build), if_none_match)
@@ -0,0 +1,177 @@
+"""
+Orchestrated refresh of all workbook-backed data (POST /api/mm/refresh-all-data)
+The three stages write disjoint tables - areas/dimensions, rating_scales, maturity_levels -
+so their workbooks are parsed concurrently in a process pool (MM_REFRESH_WORKERS) and the
+writes are then applied in one transaction, in the original stage order. Wall-clock time is
+roughly the slowest parse plus the writes, and a failing stage leaves the database untouched.
+Starting workers costs more than parsing small workbooks (the bundled ones, ~25 KB each,
+parse in ~20 ms), so below MM_REFRESH_PARALLEL_MIN_BYTES in total they are parsed inline.
+The writes are diffs against the current tables (table_sync.sync_table, via bulk statements),
+so unchanged rows keep their ids; every stage reports its parse/apply timings, row count and
+write rate, and "changes" the per-table inserted/updated/deleted/unchanged counts. The stages'
+data_manifest rows are written in the same transaction.
+A background refresh-all job runs parse_workbooks and apply_workbooks as its "parse" and
+"apply" stages, reporting each workbook through a progress callback; a cancelled job stops
+between parses, before anything is written.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+import openpyxl  # noqa: F401 - pandas' xlsx engine; imported here so forked workers inherit it
+from sqlalchemy.orm import Session
+
+from bulk_load import BulkLoader
+from data_manifest import record_refreshed
+from load_checksheet_data import apply_checksheet, parse_checksheet
+from load_rating_scales_data import apply_rating_scales, find_checksheet_workbook, parse_rating_scales
+from load_reports_data import REPORTS_WORKBOOK_PATH, apply_report_areas, parse_report_areas
+from reference_cache import bump_generation, AREAS, MATURITY_LEVELS, RATING_SCALES
+
+REFRESH_WORKERS = int(os.environ.get("MM_REFRESH_WORKERS", "3"))
+PARALLEL_MIN_BYTES = int(os.environ.get("MM_REFRESH_PARALLEL_MIN_BYTES", str(1024 * 1024)))
+
+
+def _reports_rows(applied):
+    area_count, dimension_count = applied
+    return area_count + dimension_count
+
+
+# (stage name, parse(path) -> records, apply(db, records, loader) -> result, rows(result) -> int)
+STAGES = [
+    ("reports", parse_report_areas, apply_report_areas, _reports_rows),
+    ("rating_scales", parse_rating_scales, apply_rating_scales, int),
+    ("maturity_levels", parse_checksheet, apply_checksheet, int),
+]
+# progress(done fraction, **details) - see parse_workbooks and apply_workbooks
+Progress = Optional[Callable[..., None]]
+
+# The data_manifest dataset each stage writes
+STAGE_DATASETS = {
+    "reports": "report_areas",
+    "rating_scales": "checksheet_rating_scales",
+    "maturity_levels": "checksheet_maturity_levels",
+}
+
+
+def _timed_parse(parse, path):
+    """Runs in a worker process (or inline); returns (records, seconds)"""
+    start = time.perf_counter()
+    records = parse(path)
+    return records, time.perf_counter() - start
+
+
+def workbook_paths() -> Dict[str, str]:
+    checksheet = find_checksheet_workbook()
+    paths = {"reports": REPORTS_WORKBOOK_PATH, "rating_scales": checksheet, "maturity_levels": checksheet}
+    missing = sorted(name for name, path in paths.items() if not path or not os.path.exists(path))
+    if missing:
+        raise FileNotFoundError(f"Workbook not found for: {', '.join(missing)}")
+    return paths
+
+
+def parse_workbooks(workers: int = REFRESH_WORKERS, parallel_min_bytes: int = PARALLEL_MIN_BYTES,
+                    progress: Progress = None) -> Tuple[Dict[str, Tuple], bool]:
+    """
+    Parse every workbook, concurrently when workers > 1 and the workbooks are large enough.
+    progress(done, workbooks={name: {"seconds", "records"}}) is called as each one finishes,
+    in stage order; it may raise (a cancelled job) to stop before the rest.
+    Returns ({name: (records, parse_seconds)}, parallel)
+    """
+    paths = workbook_paths()
+    workbook_bytes = sum(os.path.getsize(path) for path in set(paths.values()))
+    parallel = workers > 1 and workbook_bytes >= parallel_min_bytes
+    parsed, workbooks = {}, {}
+
+    def parsed_one(name, result):
+        parsed[name] = result
+        workbooks[name] = {"seconds": round(result[1], 3), "records": len(result[0])}
+        if progress:
+            progress(len(parsed) / len(STAGES), workbooks=workbooks)
+
+    if parallel:
+        with ProcessPoolExecutor(max_workers=min(workers, len(STAGES))) as pool:
+            futures = {name: pool.submit(_timed_parse, parse, paths[name]) for name, parse, _, _ in STAGES}
+            try:
+                for name, future in futures.items():
+                    parsed_one(name, future.result())
+            except Exception:
+                pool.shutdown(cancel_futures=True)
+                raise
+    else:
+        for name, parse, _, _ in STAGES:
+            parsed_one(name, _timed_parse(parse, paths[name]))
+    return parsed, parallel
+
+
+def apply_workbooks(db: Session, parsed: Dict[str, Tuple], progress: Progress = None) -> Dict:
+    """
+    Sync the tables to the parsed workbooks in one transaction, in stage order (table_sync, only
+    the rows that differ are written), with the stages' data_manifest rows. Commits on success
+    and rolls back on any error. The transaction holds the write lock throughout, so
+    progress(1.0, workbooks={name: {"seconds", "rows"}}) is called once it has committed.
+    Returns {"stages": {name: {...}}, "changes": {...}, "apply_seconds", "commit_seconds", "rows_per_second"}
+    """
+    stages, workbooks = {}, {}
+    loader = BulkLoader(db)
+    apply_started = time.perf_counter()
+    try:
+        for name, _, apply, rows in STAGES:
+            records, parse_seconds = parsed[name]
+            start = time.perf_counter()
+            result = apply(db, records, loader)
+            apply_seconds = time.perf_counter() - start
+            stages[name] = {
+                "parse_seconds": round(parse_seconds, 3),
+                "apply_seconds": round(apply_seconds, 3),
+                "rows": rows(result),
+                "rows_per_second": round(rows(result) / apply_seconds) if apply_seconds else None,
+                "result": result,
+            }
+            workbooks[name] = {"seconds": round(apply_seconds, 3), "rows": rows(result)}
+        record_refreshed(db, *(STAGE_DATASETS[name] for name, _, _, _ in STAGES))
+        commit_started = time.perf_counter()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    bump_generation(AREAS, RATING_SCALES, MATURITY_LEVELS)
+    applied = {
+        "stages": stages,
+        "changes": loader.changes,
+        "apply_seconds": round(commit_started - apply_started, 3),
+        "commit_seconds": round(time.perf_counter() - commit_started, 3),
+        "rows_per_second": loader.report()["rows_per_second"],
+    }
+    if progress:
+        progress(1.0, workbooks=workbooks)
+    return applied
+
+
+def refresh_all(db: Session, workers: int = REFRESH_WORKERS, parallel_min_bytes: int = PARALLEL_MIN_BYTES) -> Dict:
+    """
+    Parse every workbook (parse_workbooks), then sync the tables to them in one transaction
+    (apply_workbooks). Commits on success and rolls back on any error.
+    Returns {"stages": {name: {"parse_seconds", "apply_seconds", "rows", "rows_per_second", "result"}},
+    "changes": {table: {"inserted", "updated", "deleted", "unchanged"}}, "timings": {...}}
+    """
+    started = time.perf_counter()
+    parsed, parallel = parse_workbooks(workers, parallel_min_bytes)
+    parse_wall = time.perf_counter() - started
+    applied = apply_workbooks(db, parsed)
+
+    return {
+        "stages": applied["stages"],
+        "changes": applied["changes"],
+        "timings": {
+            "parse_wall_seconds": round(parse_wall, 3),
+            "parse_total_seconds": round(sum(seconds for _, seconds in parsed.values()), 3),
+            "apply_seconds": applied["apply_seconds"],
+            "commit_seconds": applied["commit_seconds"],
+            "total_seconds": round(time.perf_counter() - started, 3),
+            "rows_per_second": applied["rows_per_second"],
+            "parallel": parallel,
+            "workers": min(workers, len(STAGES)) if parallel else 1,
+        },
+    }
@@ -1,4 +1,6 @@
 from database import SessionLocal, Dimension
+from area_summary import refresh_area_summaries
+from reference_cache import bump_generation, AREAS
 
 db = SessionLocal()
 
@@ -24,7 +26,9 @@ for dim in all_dims:
 if dims_to_delete:
     print(f'\nDeleting {len(dims_to_delete)} duplicate dimensions...')
     db.query(Dimension).filter(Dimension.id.in_(dims_to_delete)).delete(synchronize_session=False)
+    refresh_area_summaries(db)
     db.commit()
+    bump_generation(AREAS)
     print('✓ Duplicates removed')
 else:
     print('\nNo duplicates found')
@@ -0,0 +1,264 @@
+"""
+Maturity assessment report rendering (HTML, optionally PDF)
+Report data is read up front with one query per scope; the HTML is then produced from
+string.Template fragments one area at a time, so a StreamingResponse can send the first
+area before the last one is rendered. PDF output needs the optional weasyprint package and
+is rendered in a worker process (MM_REPORT_PDF_WORKERS) to keep it off the request thread.
+"""
+import importlib.util
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from html import escape
+from string import Template
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database import Area, Assessment, Dimension, DimensionAssessment
+
+SCOPES = ("all", "assessment", "shop_unit")
+FORMATS = {"html": "text/html", "pdf": "application/pdf"}
+
+PDF_WORKERS = int(os.environ.get("MM_REPORT_PDF_WORKERS", "1"))
+
+# Probed without importing it: weasyprint is only imported by the PDF worker
+PDF_AVAILABLE = importlib.util.find_spec("weasyprint") is not None
+
+
+class ReportNotFound(Exception):
+    """The requested scope matches no assessment data"""
+
+
+@dataclass
+class ReportSection:
+    area_name: str
+    description: Optional[str]
+    desired_level: Optional[int]
+    # (dimension name, current level, target level)
+    rows: List[Tuple[str, int, int]] = field(default_factory=list)
+
+
+@dataclass
+class ReportData:
+    title: str
+    details: List[Tuple[str, str]]
+    sections: List[ReportSection]
+
+
+DOCUMENT_HEAD = Template("""
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>Mahindra &amp; Mahindra - $title</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; background: #fff; }
+        h1 { color: #004A96; border-bottom: 4px solid #0066CC; padding-bottom: 10px; }
+        h2 { color: #0066CC; margin-top: 30px; }
+        h3 { color: #004A96; }
+        table { width: 100%; border-collapse: collapse; margin: 20px 0; }
+        th { background: #004A96; color: white; padding: 12px; text-align: left; }
+        td { padding: 10px; border: 1px solid #ddd; }
+        .level-1 { background: #fee; }
+        .level-2 { background: #fed; }
+        .level-3 { background: #ffc; }
+        .level-4 { background: #cef; }
+        .level-5 { background: #cfc; }
+        .summary { background: #f0f8ff; padding: 20px; margin: 20px 0; border-left: 4px solid #0066CC; }
+        .footer { margin-top: 40px; padding-top: 20px; border-top: 2px solid #ddd; text-align: center; color: #666; }
+    </style>
+</head>
+<body>
+    <h1>📊 $title</h1>
+    <div class="summary">
+        <h3>Report Details</h3>
+$details
+    </div>
+""")
+
+DETAIL_LINE = Template("""        <p><strong>$label:</strong> $value</p>""")
+
+SECTION_HEAD = Template("""
+    <h2>🎯 $area_name</h2>
+    <p><strong>Description:</strong> $description</p>
+    <p><strong>Target Level:</strong> Level $desired_level</p>
+    <table>
+        <thead>
+            <tr>
+                <th>Dimension</th>
+                <th>Current Level</th>
+                <th>Target Level</th>
+                <th>Gap</th>
+                <th>Status</th>
+            </tr>
+        </thead>
+        <tbody>
+""")
+
+SECTION_ROW = Template("""            <tr class="level-$current_level">
+                <td>$name</td>
+                <td>Level $current_level</td>
+                <td>Level $desired_level</td>
+                <td>$gap levels</td>
+                <td>$status</td>
+            </tr>
+""")
+
+SECTION_TAIL = """        </tbody>
+    </table>
+"""
+
+DOCUMENT_TAIL = Template("""
+    <div class="footer">
+        <p>Generated by Mahindra &amp; Mahindra Digital Maturity Assessment System</p>
+        <p>Report Date: $generated_at</p>
+    </div>
+</body>
+</html>
+""")
+
+
+def gap_status(gap: int) -> str:
+    return "✅ On Track" if gap <= 0 else "⚠️ Below Target" if gap <= 2 else "❌ Critical Gap"
+
+
+def _sections(rows) -> List[ReportSection]:
+    """Group (area id, name, description, desired level, dimension, current, target) rows by area"""
+    sections = OrderedDict()
+    for area_id, area_name, description, area_level, name, current_level, desired_level in rows:
+        if area_id not in sections:
+            sections[area_id] = ReportSection(area_name, description, area_level)
+        if name is not None:
+            sections[area_id].rows.append((name, current_level, desired_level))
+    return list(sections.values())
+
+
+def _dimension_query(*level_column, outer=False):
+    return select(
+        Area.id, Area.name, Area.description, Area.desired_level,
+        Dimension.name, *level_column, Dimension.desired_level
+    ).join(Dimension, Dimension.area_id == Area.id, isouter=outer)
+
+
+def load_all_areas(db: Session) -> ReportData:
+    # Outer join: areas without dimensions still get their (empty) section
+    rows = db.execute(_dimension_query(Dimension.current_level, outer=True).order_by(Area.id, Dimension.id)).all()
+    sections = _sections(rows)
+    return ReportData(
+        title="Digital Maturity Assessment Report",
+        details=[
+            ("Organization", "Mahindra & Mahindra"),
+            ("Assessment Date", datetime.now().strftime('%B %d, %Y')),
+            ("Total Areas", str(len(sections))),
+            ("Total Dimensions", str(sum(len(section.rows) for section in sections))),
+        ],
+        sections=sections,
+    )
+
+
+def load_assessment(db: Session, assessment_id: int) -> ReportData:
+    assessment = db.get(Assessment, assessment_id)
+    if assessment is None:
+        raise ReportNotFound("Assessment not found")
+    rows = db.execute(
+        _dimension_query(DimensionAssessment.current_level)
+        .join(DimensionAssessment, DimensionAssessment.dimension_id == Dimension.id)
+        .where(DimensionAssessment.assessment_id == assessment_id)
+        .order_by(Area.id, Dimension.id)
+    ).all()
+    when = assessment.assessment_date or assessment.created_at
+    return ReportData(
+        title=f"Assessment Report #{assessment.id}",
+        details=[
+            ("Plant", assessment.plant_name or "-"),
+            ("Shop Unit", assessment.shop_unit or "-"),
+            ("Assessor", assessment.assessor_name or "-"),
+            ("Assessment Date", when.strftime('%B %d, %Y') if when else "-"),
+            ("Dimensions Scored", str(len(rows))),
+        ],
+        sections=_sections(rows),
+    )
+
+
+def load_shop_unit(db: Session, shop_unit: str, plant_name: Optional[str] = None) -> ReportData:
+    """Latest scored level of each dimension across the shop unit's assessments"""
+    query = (
+        _dimension_query(DimensionAssessment.current_level)
+        .add_columns(Dimension.id, Assessment.id)
+        .join(DimensionAssessment, DimensionAssessment.dimension_id == Dimension.id)
+        .join(Assessment, Assessment.id == DimensionAssessment.assessment_id)
+        .where(Assessment.shop_unit == shop_unit)
+    )
+    if plant_name:
+        query = query.where(Assessment.plant_name == plant_name)
+    latest = {}
+    assessment_ids = set()
+    # Oldest first, so the most recent assessment of a dimension wins - as in scoring
+    for row in db.execute(query.order_by(Assessment.created_at, Assessment.id)):
+        latest[(row[0], row[7])] = row[:7]
+        assessment_ids.add(row[8])
+    if not assessment_ids:
+        raise ReportNotFound("No scored assessments for this shop unit")
+    rows = [latest[key] for key in sorted(latest)]
+    details = [("Shop Unit", shop_unit)]
+    if plant_name:
+        details.append(("Plant", plant_name))
+    details += [("Assessments", str(len(assessment_ids))), ("Dimensions Scored", str(len(rows)))]
+    return ReportData(title=f"{shop_unit} Maturity Report", details=details, sections=_sections(rows))
+
+
+def render_html(report: ReportData) -> Iterator[str]:
+    """Yield the report document: the head, one chunk per area, the footer"""
+    yield DOCUMENT_HEAD.substitute(
+        title=escape(report.title),
+        details="\n".join(DETAIL_LINE.substitute(label=escape(label), value=escape(value))
+                          for label, value in report.details),
+    )
+    for section in report.sections:
+        parts = [SECTION_HEAD.substitute(
+            area_name=escape(section.area_name),
+            description=escape(section.description or ""),
+            desired_level=section.desired_level,
+        )]
+        for name, current_level, desired_level in section.rows:
+            gap = desired_level - current_level
+            parts.append(SECTION_ROW.substitute(
+                name=escape(name), current_level=current_level, desired_level=desired_level,
+                gap=gap, status=gap_status(gap),
+            ))
+        parts.append(SECTION_TAIL)
+        yield "".join(parts)
+    yield DOCUMENT_TAIL.substitute(generated_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+
+
+def _html_to_pdf(html: str) -> bytes:
+    """Runs in a worker process"""
+    from weasyprint import HTML
+    return HTML(string=html).write_pdf()
+
+
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+
+def render_pdf(report: ReportData) -> bytes:
+    """Render the report to PDF in the worker pool; raises RuntimeError without weasyprint"""
+    global _pdf_pool
+    if not PDF_AVAILABLE:
+        raise RuntimeError("PDF output requires the weasyprint package")
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            _pdf_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS)
+    return _pdf_pool.submit(_html_to_pdf, "".join(render_html(report))).result()
+
+
+def shutdown_pdf_pool():
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown(cancel_futures=True)
+            _pdf_pool = None
@@ -0,0 +1,29 @@
+"""
+Reporting helpers shared by the sync and async report endpoints
+"""
+
+
+def area_counts(dimensions):
+    """(total, current_level_sum, on_track, completed) over an area's dimensions"""
+    on_track = sum(1 for d in dimensions if d.current_level >= d.desired_level - 1)
+    completed = sum(1 for d in dimensions if d.current_level >= d.desired_level)
+    return len(dimensions), sum(d.current_level for d in dimensions), on_track, completed
+
+
+def format_area_summary(area_id, area_name, desired_level, total, level_sum, on_track, completed):
+    """One entry of GET /api/mm/reports/summary, built from the area's counters"""
+    return {
+        "area_id": area_id,
+        "area_name": area_name,
+        "desired_level": desired_level,
+        "avg_current_level": round(level_sum / total, 1) if total else 0,
+        "total_dimensions": total,
+        "on_track_count": on_track,
+        "completed_count": completed,
+        "needs_attention": total - on_track
+    }
+
+
+def summarize_area(area, dimensions):
+    """Summary statistics for one area, computed from its dimensions"""
+    return format_area_summary(area.id, area.name, area.desired_level, *area_counts(dimensions))
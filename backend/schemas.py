@@ -0,0 +1,125 @@
+"""
+Pydantic request/response models for the M&M Digital Maturity APIs
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, conint
+
+class DimensionResponse(BaseModel):
+    id: int
+    name: str
+    current_level: int
+    desired_level: int
+    updated_at: datetime
+    
+    class Config:
+        orm_mode = True
+
+class AreaResponse(BaseModel):
+    id: int
+    name: str
+    description: Optional[str]
+    desired_level: Optional[int]
+    dimensions: List[DimensionResponse]
+    
+    class Config:
+        orm_mode = True
+
+class MaturityLevelResponse(BaseModel):
+    id: int
+    dimension_id: Optional[int]
+    level: int
+    name: str
+    sub_level: Optional[str]
+    category: Optional[str]
+    description: str
+    
+    class Config:
+        orm_mode = True
+
+class RatingScaleResponse(BaseModel):
+    id: int
+    dimension_name: str
+    level: int
+    rating_name: str
+    digital_maturity_description: str
+    business_relevance: Optional[str] = None
+    
+    class Config:
+        orm_mode = True
+
+class DimensionUpdate(BaseModel):
+    current_level: int
+    desired_level: Optional[int]
+
+class AssessmentCreate(BaseModel):
+    plant_name: Optional[str] = None
+    shop_unit: Optional[str] = None
+    dimension_id: Optional[int] = None
+    assessor_name: Optional[str] = None
+    notes: Optional[str] = None
+    level1_notes: Optional[str] = None
+    level2_notes: Optional[str] = None
+    level3_notes: Optional[str] = None
+    level4_notes: Optional[str] = None
+    level5_notes: Optional[str] = None
+    level1_image: Optional[str] = None
+    level2_image: Optional[str] = None
+    level3_image: Optional[str] = None
+    level4_image: Optional[str] = None
+    level5_image: Optional[str] = None
+    overall_count: Optional[int] = 0
+    checked_count: Optional[int] = 0
+
+class AssessmentResponse(BaseModel):
+    id: int
+    plant_name: Optional[str] = None
+    shop_unit: Optional[str] = None
+    dimension_id: Optional[int] = None
+    assessment_date: datetime
+    assessor_name: Optional[str] = None
+    notes: Optional[str] = None
+    level1_notes: Optional[str] = None
+    level2_notes: Optional[str] = None
+    level3_notes: Optional[str] = None
+    level4_notes: Optional[str] = None
+    level5_notes: Optional[str] = None
+    level1_image: Optional[str] = None
+    level2_image: Optional[str] = None
+    level3_image: Optional[str] = None
+    level4_image: Optional[str] = None
+    level5_image: Optional[str] = None
+    overall_count: Optional[int] = 0
+    checked_count: Optional[int] = 0
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        orm_mode = True
+
+class ChecksheetSelectionCreate(BaseModel):
+    assessment_id: Optional[int] = None
+    maturity_level_id: int
+    is_selected: bool
+    evidence: Optional[str] = None
+
+class ScoreBatchRequest(BaseModel):
+    assessment_ids: Optional[List[int]] = None
+    plant_name: Optional[str] = None
+    shop_unit: Optional[str] = None
+    dry_run: bool = False
+    threshold: Optional[float] = None
+    workers: conint(ge=0) = 0  # > 1 asks for a process pool on very large batches, capped by MM_SCORING_WORKERS
+
+class ChecksheetSelectionResponse(BaseModel):
+    id: int
+    assessment_id: Optional[int] = None
+    maturity_level_id: int
+    is_selected: bool
+    evidence: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        orm_mode = True
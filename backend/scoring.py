@@ -0,0 +1,397 @@
+"""
+Per-dimension, completeness-aware maturity scoring for checksheet assessments
+Criteria are the lettered checksheet items (e.g. "1.1a"). Each one belongs to a dimension
+through MaturityLevel.dimension_id, or through a category that names the dimension; items
+with neither form a shared checksheet applied to dimensions that have no criteria of their own.
+A dimension reaches the highest level whose criteria are at least `threshold` complete.
+"""
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, insert, update
+from sqlalchemy.orm import Session
+
+from area_summary import refresh_summaries_for_dimensions
+from database import Assessment, ChecksheetSelection, Dimension, DimensionAssessment, MaturityLevel
+from naming import normalize_dimension_name
+
+# Share of a level's criteria that must be selected for the level to count as achieved
+DEFAULT_COMPLETENESS_THRESHOLD = float(os.environ.get("MM_SCORING_THRESHOLD", "1.0"))
+
+# Level reported for a dimension that has criteria but has not completed any level
+BASELINE_LEVEL = 1
+
+# Lettered sub-levels ("1.1a", "2.3b") are the selectable criteria; "1.1" rows are headings
+CRITERIA_FILTER = MaturityLevel.sub_level.op("GLOB")("*[a-zA-Z]")
+
+SHARED = None
+
+# Most processes batch scoring may use, whatever the caller asks for (never more than the CPUs)
+MAX_SCORING_WORKERS = min(int(os.environ.get("MM_SCORING_WORKERS", os.cpu_count() or 1)), os.cpu_count() or 1)
+
+# Assessment ids per IN (...) clause, and per process-pool task in batch scoring
+ID_CHUNK_SIZE = 500
+
+
+def criteria_totals(db: Session) -> List[Tuple]:
+    """(dimension_id, category, level, total) for every group of checksheet criteria"""
+    return (
+        db.query(MaturityLevel.dimension_id, MaturityLevel.category, MaturityLevel.level, func.count(MaturityLevel.id))
+        .filter(CRITERIA_FILTER, MaturityLevel.level.isnot(None))
+        .group_by(MaturityLevel.dimension_id, MaturityLevel.category, MaturityLevel.level)
+        .all()
+    )
+
+
+def selected_counts(db: Session, assessment_ids: Iterable[int]) -> List[Tuple]:
+    """(assessment_id, dimension_id, category, level, selected) for the given assessments"""
+    return (
+        db.query(
+            ChecksheetSelection.assessment_id,
+            MaturityLevel.dimension_id,
+            MaturityLevel.category,
+            MaturityLevel.level,
+            func.count(ChecksheetSelection.id)
+        )
+        .join(MaturityLevel, MaturityLevel.id == ChecksheetSelection.maturity_level_id)
+        .filter(
+            ChecksheetSelection.assessment_id.in_(list(assessment_ids)),
+            ChecksheetSelection.is_selected == True,
+            CRITERIA_FILTER,
+            MaturityLevel.level.isnot(None)
+        )
+        .group_by(
+            ChecksheetSelection.assessment_id, MaturityLevel.dimension_id, MaturityLevel.category, MaturityLevel.level
+        )
+        .all()
+    )
+
+
+def _owner_resolver(dimensions: List[Tuple]):
+    """Map a criterion group (dimension_id, category) to the scoped dimension ids it counts towards"""
+    scoped_ids = {dimension_id for dimension_id, _ in dimensions}
+    by_name = defaultdict(list)
+    for dimension_id, name in dimensions:
+        by_name[normalize_dimension_name(name)].append(dimension_id)
+
+    cache = {}
+
+    def resolve(dimension_id: Optional[int], category: Optional[str]):
+        key = (dimension_id, category)
+        if key not in cache:
+            if dimension_id is not None:
+                cache[key] = [dimension_id] if dimension_id in scoped_ids else []
+            else:
+                cache[key] = by_name.get(normalize_dimension_name(category), SHARED)
+        return cache[key]
+
+    return resolve
+
+
+def compute_dimension_levels(
+    totals: Iterable[Tuple],
+    selected: Iterable[Tuple],
+    dimensions: List[Tuple],
+    threshold: float = DEFAULT_COMPLETENESS_THRESHOLD
+) -> Dict[int, Dict]:
+    """
+    Score every dimension in one pass over the aggregated criteria groups.
+    totals: (dimension_id, category, level, total); selected: (dimension_id, category, level, selected);
+    dimensions: (id, name) of the dimensions in scope.
+    Returns {dimension_id: {"level", "completeness": {level: ratio}}} for dimensions that have criteria.
+    """
+    resolve = _owner_resolver(dimensions)
+
+    # Per owner (dimension id or SHARED) and level: [total, selected]
+    counts = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+    for dimension_id, category, level, total in totals:
+        owners = resolve(dimension_id, category)
+        for owner in ([SHARED] if owners is SHARED else owners):
+            counts[owner][level][0] += total
+    for dimension_id, category, level, count in selected:
+        owners = resolve(dimension_id, category)
+        for owner in ([SHARED] if owners is SHARED else owners):
+            counts[owner][level][1] += count
+
+    shared = counts.get(SHARED)
+    scores = {}
+    for dimension_id, _ in dimensions:
+        levels = counts.get(dimension_id) or shared
+        if not levels:
+            continue
+        completeness = {
+            level: round(min(done, total) / total, 4) if total else 0.0
+            for level, (total, done) in sorted(levels.items())
+        }
+        achieved = [level for level, ratio in completeness.items() if ratio >= threshold]
+        scores[dimension_id] = {
+            "level": max(achieved) if achieved else BASELINE_LEVEL,
+            "completeness": completeness
+        }
+    return scores
+
+
+def scoped_dimensions(db: Session, assessment: Assessment) -> List[Tuple]:
+    """(id, name, current_level) of the dimensions an assessment scores"""
+    columns = (Dimension.id, Dimension.name, Dimension.current_level)
+    if assessment.dimension_id:
+        dimensions = db.query(*columns).filter(Dimension.id == assessment.dimension_id).all()
+        if dimensions:
+            return dimensions
+    dimensions = db.query(*columns).filter(Dimension.area_id == assessment.area_id).all()
+    if not dimensions:
+        dimensions = db.query(*columns).all()
+    return dimensions
+
+
+def write_scores(db: Session, assessment_id: int, dimensions: List[Tuple], scores: Dict[int, Dict]) -> int:
+    """Write only the dimension assessments and dimensions whose level changed; returns rows written"""
+    if not scores:
+        return 0
+
+    existing = {
+        dimension_id: (row_id, current_level)
+        for row_id, dimension_id, current_level in db.query(
+            DimensionAssessment.id, DimensionAssessment.dimension_id, DimensionAssessment.current_level
+        ).filter(
+            DimensionAssessment.assessment_id == assessment_id,
+            DimensionAssessment.dimension_id.in_(list(scores))
+        ).all()
+    }
+    return write_score_changes(db, [(assessment_id, dimensions, scores)], {assessment_id: existing})
+
+
+def write_score_changes(db: Session, scored: List[Tuple], existing: Dict[int, Dict]) -> int:
+    """
+    Apply level changes for several assessments with one statement per kind of write.
+    scored: (assessment_id, dimensions, scores); existing: {assessment_id: {dimension_id: (row_id, level)}}
+    """
+    now = datetime.utcnow()
+    inserts = []
+    updates = []
+    dimension_levels = {}
+    current_levels = {}
+    for assessment_id, dimensions, scores in scored:
+        stored = existing.get(assessment_id, {})
+        for dimension_id, _, current_level in dimensions:
+            current_levels[dimension_id] = current_level
+            if dimension_id not in scores:
+                continue
+            level = scores[dimension_id]["level"]
+            dimension_levels[dimension_id] = level
+            if dimension_id not in stored:
+                inserts.append({
+                    "assessment_id": assessment_id,
+                    "dimension_id": dimension_id,
+                    "current_level": level,
+                    "evidence": f"Calculated from checksheet selections (Level {level})",
+                    "created_at": now
+                })
+            elif stored[dimension_id][1] != level:
+                updates.append({"id": stored[dimension_id][0], "current_level": level})
+
+    if inserts:
+        db.execute(insert(DimensionAssessment), inserts)
+    if updates:
+        db.execute(update(DimensionAssessment), updates)
+
+    # Base dimension levels feed the reports; only rewrite the ones that moved
+    dimension_updates = [
+        {"id": dimension_id, "current_level": level, "updated_at": now}
+        for dimension_id, level in dimension_levels.items()
+        if current_levels.get(dimension_id) != level
+    ]
+    if dimension_updates:
+        db.execute(update(Dimension), dimension_updates)
+        refresh_summaries_for_dimensions(db, [row["id"] for row in dimension_updates])
+
+    return len(inserts) + len(updates)
+
+
+def score_assessment(
+    db: Session,
+    assessment: Assessment,
+    dry_run: bool = False,
+    threshold: float = DEFAULT_COMPLETENESS_THRESHOLD
+) -> Dict:
+    """
+    Score every dimension of an assessment and persist the levels that changed.
+    With dry_run the computed levels are returned and nothing is written, so no write lock is taken.
+    The caller owns the transaction (commit/rollback).
+    """
+    selected = [row[1:] for row in selected_counts(db, [assessment.id])]
+    selected_count = sum(row[3] for row in selected)
+
+    if not selected:
+        return {
+            "status": "info",
+            "message": "No capabilities selected yet",
+            "dimensions_updated": 0,
+            "calculated_level": 0,
+            "dry_run": dry_run
+        }
+
+    dimensions = scoped_dimensions(db, assessment)
+    scores = compute_dimension_levels(
+        criteria_totals(db), selected, [(dimension_id, name) for dimension_id, name, _ in dimensions], threshold
+    )
+
+    if dry_run:
+        previous = {}
+        if scores:
+            previous = dict(db.query(DimensionAssessment.dimension_id, DimensionAssessment.current_level).filter(
+                DimensionAssessment.assessment_id == assessment.id,
+                DimensionAssessment.dimension_id.in_(list(scores))
+            ).all())
+        dimensions_updated = sum(
+            1 for dimension_id, score in scores.items() if previous.get(dimension_id) != score["level"]
+        )
+    else:
+        dimensions_updated = write_scores(db, assessment.id, dimensions, scores)
+
+    return {
+        "status": "success",
+        "message": f"Calculated dimension scores based on {selected_count} selected capabilities",
+        "selected_count": selected_count,
+        "calculated_level": max((score["level"] for score in scores.values()), default=0),
+        "threshold": threshold,
+        "dimensions_updated": dimensions_updated,
+        "dimensions": [
+            {
+                "dimension_id": dimension_id,
+                "name": name,
+                "previous_level": current_level,
+                "calculated_level": scores[dimension_id]["level"],
+                "completeness": scores[dimension_id]["completeness"]
+            }
+            for dimension_id, name, current_level in dimensions
+            if dimension_id in scores
+        ],
+        "assessment_id": assessment.id,
+        "dry_run": dry_run
+    }
+
+
+def _chunks(items: List, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _score_chunk(totals: List[Tuple], jobs: List[Tuple], threshold: float) -> List[Tuple]:
+    """Process-pool task: jobs are (assessment_id, selected, dimensions)"""
+    return [
+        (assessment_id, compute_dimension_levels(totals, selected, dimensions, threshold))
+        for assessment_id, selected, dimensions in jobs
+    ]
+
+
+def score_assessments(
+    db: Session,
+    assessments: List[Assessment],
+    dry_run: bool = False,
+    threshold: float = DEFAULT_COMPLETENESS_THRESHOLD,
+    workers: int = 0
+) -> Dict:
+    """
+    Score many assessments at once: one query for criteria totals, one for all of their
+    selections, levels computed in memory (optionally across `workers` processes, capped at
+    MAX_SCORING_WORKERS) and every change written with one statement per kind of write.
+    Assessments are applied oldest first, so the most recent assessment of a dimension sets
+    its reported current level.
+    The caller owns the transaction (commit/rollback).
+    """
+    assessments = sorted(assessments, key=lambda a: (a.created_at or datetime.min, a.id))
+    assessment_ids = [assessment.id for assessment in assessments]
+
+    totals = [tuple(row) for row in criteria_totals(db)]
+    selected_by_assessment = defaultdict(list)
+    for chunk in _chunks(assessment_ids, ID_CHUNK_SIZE):
+        for assessment_id, dimension_id, category, level, count in selected_counts(db, chunk):
+            selected_by_assessment[assessment_id].append((dimension_id, category, level, count))
+
+    all_dimensions = db.query(Dimension.id, Dimension.name, Dimension.current_level, Dimension.area_id).all()
+    by_id = {row.id: row for row in all_dimensions}
+    by_area = defaultdict(list)
+    for row in all_dimensions:
+        by_area[row.area_id].append(row)
+
+    def scope(assessment):
+        if assessment.dimension_id in by_id:
+            rows = [by_id[assessment.dimension_id]]
+        else:
+            rows = by_area.get(assessment.area_id) or all_dimensions
+        return [(row.id, row.name, row.current_level) for row in rows]
+
+    jobs = []
+    scoped = {}
+    for assessment in assessments:
+        if not selected_by_assessment.get(assessment.id):
+            continue
+        scoped[assessment.id] = scope(assessment)
+        jobs.append((
+            assessment.id,
+            selected_by_assessment[assessment.id],
+            [(dimension_id, name) for dimension_id, name, _ in scoped[assessment.id]]
+        ))
+
+    workers = min(workers or 0, MAX_SCORING_WORKERS)
+    if workers > 1 and len(jobs) > ID_CHUNK_SIZE:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_score_chunk, totals, chunk, threshold) for chunk in _chunks(jobs, ID_CHUNK_SIZE)]
+            computed = [result for future in futures for result in future.result()]
+    else:
+        computed = _score_chunk(totals, jobs, threshold)
+    scores = dict(computed)
+
+    existing = defaultdict(dict)
+    for chunk in _chunks(list(scores), ID_CHUNK_SIZE):
+        for row_id, assessment_id, dimension_id, current_level in db.query(
+            DimensionAssessment.id, DimensionAssessment.assessment_id,
+            DimensionAssessment.dimension_id, DimensionAssessment.current_level
+        ).filter(DimensionAssessment.assessment_id.in_(chunk)).all():
+            existing[assessment_id][dimension_id] = (row_id, current_level)
+
+    if dry_run:
+        dimensions_updated = sum(
+            1
+            for assessment_id, dimension_scores in scores.items()
+            for dimension_id, score in dimension_scores.items()
+            if existing[assessment_id].get(dimension_id, (None, None))[1] != score["level"]
+        )
+    else:
+        dimensions_updated = write_score_changes(
+            db,
+            [(assessment_id, scoped[assessment_id], scores[assessment_id]) for assessment_id in scores],
+            existing
+        )
+
+    results = []
+    for assessment_id in assessment_ids:
+        dimension_scores = scores.get(assessment_id)
+        if dimension_scores is None:
+            results.append({"assessment_id": assessment_id, "status": "info", "calculated_level": 0, "dimensions": []})
+            continue
+        results.append({
+            "assessment_id": assessment_id,
+            "status": "success",
+            "selected_count": sum(row[3] for row in selected_by_assessment[assessment_id]),
+            "calculated_level": max((score["level"] for score in dimension_scores.values()), default=0),
+            "dimensions": [
+                {"dimension_id": dimension_id, "calculated_level": score["level"]}
+                for dimension_id, score in dimension_scores.items()
+            ]
+        })
+
+    return {
+        "status": "success",
+        "message": f"Scored {len(scores)} of {len(assessment_ids)} assessments",
+        "assessments_requested": len(assessment_ids),
+        "assessments_scored": len(scores),
+        "dimensions_updated": dimensions_updated,
+        "threshold": threshold,
+        "dry_run": dry_run,
+        "results": results
+    }
@@ -0,0 +1,164 @@
+"""
+Prebuilt reference-data snapshot for serverless cold starts
+On Vercel the database lives in /tmp and starts empty on every cold start. Instead of running
+the seed and workbook loaders there (pandas/openpyxl over the Excel files, ~seconds), the build
+runs them once into a fresh database, compacts it (VACUUM, rollback journal) and stamps it
+with a version: a hash of the source workbooks and loader modules. At cold start
+restore_snapshot() copies it into place when the stamp matches the files deployed alongside
+it; otherwise, or when the snapshot is missing, the loaders run (data_manifest.ensure_datasets).
+The snapshot carries its data_manifest rows, so a restored copy needs no reload. Migrations
+added after the build still apply, as init_db runs on the restored copy. `status` also fails
+when .vercelignore would leave the snapshot or one of its sources out of the deployment.
+
+Usage:
+    python snapshot.py build [--output reference_snapshot.db]
+    python snapshot.py status
+"""
+import argparse
+import fnmatch
+import hashlib
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from data_manifest import DATASETS, REFERENCE_DATASETS, source_file_hash
+
+BACKEND_DIR = Path(__file__).resolve().parent
+SNAPSHOT_PATH = Path(os.environ.get("MM_SNAPSHOT_PATH", BACKEND_DIR / "reference_snapshot.db"))
+DEPLOY_IGNORE_FILE = BACKEND_DIR.parent / ".vercelignore"
+
+# Bump when the stamp or the build changes meaning (2: snapshots carry data_manifest)
+SNAPSHOT_FORMAT = 2
+
+# Everything the loaded data depends on
+SOURCE_FILES = list(dict.fromkeys(path for name in REFERENCE_DATASETS for path in DATASETS[name].sources))
+
+
+def snapshot_version() -> str:
+    """Version of the data the current sources produce; a missing source counts as changed"""
+    material = [f"format={SNAPSHOT_FORMAT}"] + [f"{name}=v{DATASETS[name].version}" for name in REFERENCE_DATASETS]
+    material += [f"{path.name}={source_file_hash(path)}" for path in SOURCE_FILES]
+    return hashlib.blake2b("|".join(material).encode(), digest_size=16).hexdigest()
+
+
+def deploy_ignored(path, ignore_file=DEPLOY_IGNORE_FILE) -> bool:
+    """
+    Whether the ignore file leaves `path` out of the upload. gitignore-style: the last matching
+    pattern wins and "!" re-includes; a pattern with a "/" matches the path from the repository
+    root, one without matches any file or directory name along it.
+    """
+    if not ignore_file.exists():
+        return False
+    try:
+        parts = Path(path).resolve().relative_to(ignore_file.parent.resolve()).parts
+    except ValueError:
+        return False
+    candidates = ["/".join(parts[:end]) for end in range(1, len(parts) + 1)]  # each parent directory, then the file
+    ignored = False
+    for line in ignore_file.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        pattern = line.lstrip("!").strip("/")
+        for candidate in candidates:
+            target = candidate if "/" in pattern else candidate.rsplit("/", 1)[-1]
+            if fnmatch.fnmatchcase(target, pattern):
+                ignored = not negate
+                break
+    return ignored
+
+
+def read_stamp(path=SNAPSHOT_PATH):
+    """The version a snapshot was built with, or None when it is missing or unreadable"""
+    if not os.path.exists(path):
+        return None
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            return conn.execute("SELECT version FROM snapshot_stamp").fetchone()[0]
+        finally:
+            conn.close()
+    except (sqlite3.Error, TypeError):
+        return None
+
+
+def restore_snapshot(target, path=SNAPSHOT_PATH) -> str:
+    """
+    Copy the snapshot to `target` if `target` has no data yet and the snapshot is current.
+    Returns "existing" (target already there, left alone), "restored", "stale" or "missing".
+    """
+    if os.path.exists(target) and os.path.getsize(target) > 0:
+        return "existing"
+    stamp = read_stamp(path)
+    if stamp is None:
+        return "missing"
+    if stamp != snapshot_version():
+        return "stale"
+    partial = f"{target}.restoring"
+    shutil.copyfile(path, partial)
+    os.replace(partial, target)
+    return "restored"
+
+
+def build_snapshot(output=SNAPSHOT_PATH) -> str:
+    """Load everything into a scratch database, compact and stamp it, and move it to `output`"""
+    version = snapshot_version()
+    with tempfile.TemporaryDirectory() as tmp:
+        # database.DB_PATH is relative to the working directory, so the loaders run in a child
+        # process started in the scratch directory
+        env = {key: value for key, value in os.environ.items() if key != "VERCEL"}
+        env["PYTHONPATH"] = str(BACKEND_DIR)
+        env["MM_WORKBOOK_CACHE"] = "0"
+        subprocess.run(
+            [sys.executable, "-c", "import sys; from database import init_db; init_db(); "
+                                   "from data_manifest import REFERENCE_DATASETS, ensure_datasets; "
+                                   "sys.exit('failed' in ensure_datasets(REFERENCE_DATASETS).values())"],
+            cwd=tmp, env=env, check=True, stdout=subprocess.DEVNULL
+        )
+        built = os.path.join(tmp, "manufacturing.db")
+        conn = sqlite3.connect(built)
+        try:
+            conn.execute("CREATE TABLE snapshot_stamp (version VARCHAR NOT NULL, built_at DATETIME NOT NULL)")
+            conn.execute("INSERT INTO snapshot_stamp VALUES (?, datetime('now'))", (version,))
+            conn.commit()
+            # A single self-contained file: no -wal/-shm beside it, no free pages
+            conn.execute("PRAGMA journal_mode=DELETE")
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+        partial = f"{output}.building"
+        shutil.copyfile(built, partial)
+        os.replace(partial, output)
+    return version
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["build", "status"])
+    parser.add_argument("--output", default=str(SNAPSHOT_PATH))
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        version = build_snapshot(args.output)
+        print(f"Built {args.output} ({os.path.getsize(args.output) / 1024:.0f} KiB, version {version}) "
+              f"in {time.perf_counter() - start:.1f}s")
+    else:
+        stamp, current = read_stamp(args.output), snapshot_version()
+        state = "missing" if stamp is None else "current" if stamp == current else "stale"
+        print(f"{args.output}: {state} (snapshot {stamp}, sources {current})")
+        # Left out of the upload, the snapshot is "missing" (or, without a source, "stale") at every cold start
+        excluded = [path for path in [Path(args.output)] + SOURCE_FILES if deploy_ignored(path)]
+        for path in excluded:
+            print(f"  excluded from the deployment by {DEPLOY_IGNORE_FILE.name}: {path}")
+        sys.exit(0 if state == "current" and not excluded else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Diff-based table refresh for the workbook and seed loaders
+sync_table() matches incoming rows to the current table on a natural key (NATURAL_KEYS) and
+writes only the difference - inserts for new keys, updates for rows whose values changed,
+deletes for keys no longer present - through the caller's BulkLoader, inside the caller's
+transaction. Rows that survive keep their ids, so references such as
+ChecksheetSelection.maturity_level_id stay valid. The diff is read and written in one
+transaction that holds the write lock from the start (bulk_load.begin_write); WAL readers keep
+seeing the previous rows until it commits, never an emptied or half-written table.
+A key may repeat (a dimension spread over several RatingScales columns): the n-th incoming
+row with a key pairs with the n-th existing one, in id order. With missing_only=True only the
+inserts are written (the seed data fills gaps and never overwrites loaded catalogs).
+"""
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from bulk_load import BulkLoader, begin_write, prepare_rows
+from database import Area, Dimension, MaturityLevel, RatingScale
+
+NATURAL_KEYS = {
+    Area: ("name",),
+    Dimension: ("area_id", "name"),
+    MaturityLevel: ("dimension_id", "level", "sub_level", "category"),
+    RatingScale: ("dimension_name", "level"),
+}
+
+
+@dataclass
+class SyncResult:
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    ids: List[int] = field(default_factory=list)  # id of every incoming row, in row order
+
+    def counts(self) -> Dict[str, int]:
+        return {"inserted": self.inserted, "updated": self.updated,
+                "deleted": self.deleted, "unchanged": self.unchanged}
+
+
+def _data_columns(model) -> Dict[str, object]:
+    """Column name -> value a fresh insert would give it, skipping the id and timestamps"""
+    columns = {}
+    for column in model.__table__.columns:
+        if column.primary_key or (column.default is not None and column.default.is_callable):
+            continue
+        columns[column.name] = column.default.arg if column.default is not None else None
+    return columns
+
+
+def sync_table(db: Session, model, rows: Iterable[dict], loader: BulkLoader = None,
+               key: Sequence[str] = None, where=None, missing_only: bool = False) -> SyncResult:
+    """
+    Make the table (or the part of it matching `where`) hold exactly `rows`, writing only
+    what differs. Columns a row leaves out get their defaults, as with a fresh insert; ids and
+    timestamps are left alone. missing_only inserts the rows whose key is absent and leaves
+    every existing row as it is. The caller commits.
+    """
+    loader = loader or BulkLoader(db)
+    key = tuple(key or NATURAL_KEYS[model])
+    defaults = _data_columns(model)
+    columns = list(defaults)
+    rows = [{**defaults, **row} for row in prepare_rows(model, rows)]
+
+    begin_write(db)
+    query = select(model.id, *(getattr(model, column) for column in columns)).order_by(model.id)
+    if where is not None:
+        query = query.where(where)
+    existing = defaultdict(deque)  # key -> deque of (id, {column: value})
+    for row_id, *values in db.execute(query):
+        current = dict(zip(columns, values))
+        existing[tuple(current[column] for column in key)].append((row_id, current))
+
+    result = SyncResult()
+    inserts, insert_positions, updates = [], [], []
+    for position, row in enumerate(rows):
+        matches = existing.get(tuple(row[column] for column in key))
+        if not matches:
+            inserts.append(row)
+            insert_positions.append(position)
+            result.ids.append(None)
+            continue
+        row_id, current = matches.popleft()
+        result.ids.append(row_id)
+        if not missing_only and any(current[column] != value for column, value in row.items()):
+            updates.append({**row, "id": row_id})
+        else:
+            result.unchanged += 1
+
+    stale = [] if missing_only else [row_id for matches in existing.values() for row_id, _ in matches]
+    loader.delete_ids(model, stale)
+    loader.update(model, updates)
+    for position, row_id in zip(insert_positions, loader.insert(model, inserts, return_ids=True)):
+        result.ids[position] = row_id
+
+    result.inserted, result.updated, result.deleted = len(inserts), len(updates), len(stale)
+    loader.record_sync(model, result)
+    return result
@@ -0,0 +1,130 @@
+"""
+Parse-once cache for the Excel workbooks behind the data loaders
+The first read of a workbook parses every sheet in one pass (header=None, as all loaders read
+them) and pickles the frames to MM_WORKBOOK_CACHE_DIR, keyed by the file's path, mtime and
+content hash. Later reads of an unchanged workbook - from any loader, in any process - load
+the pickle instead of going through openpyxl, and repeat reads within a process are served
+from memory. MM_WORKBOOK_CACHE=0 turns the disk cache off. Pickle rather than Parquet/Arrow:
+pyarrow is not a dependency, and the sheets mix text and numbers in the same column.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd  # imported where a workbook is parsed; content_hash() users skip it
+
+CACHE_ENABLED = os.environ.get("MM_WORKBOOK_CACHE", "1") != "0"
+if os.environ.get("VERCEL"):
+    # Only /tmp is writable on serverless
+    DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "mm_workbook_cache")
+else:
+    DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".workbook_cache")
+CACHE_DIR = os.environ.get("MM_WORKBOOK_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+# Bump when the pickled layout changes
+CACHE_FORMAT = 1
+
+_memory: Dict[str, tuple] = {}  # resolved path -> (key, {sheet name: frame})
+_lock = threading.Lock()
+_stats = {"memory_hits": 0, "disk_hits": 0, "parses": 0}
+
+
+def content_hash(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def workbook_key(path: Path) -> str:
+    """Cache key of a workbook's current state: path, mtime and content hash"""
+    stat = path.stat()
+    material = f"{CACHE_FORMAT}|{path}|{stat.st_mtime_ns}|{content_hash(path)}"
+    return hashlib.blake2b(material.encode(), digest_size=16).hexdigest()
+
+
+def _path_prefix(path: Path) -> str:
+    return hashlib.blake2b(str(path).encode(), digest_size=8).hexdigest()
+
+
+def _load_pickle(cache_file: str) -> Optional[Dict[str, "pd.DataFrame"]]:
+    try:
+        with open(cache_file, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Truncated or written by an incompatible pandas - parse again and overwrite
+        return None
+
+
+def _store_pickle(path: Path, cache_file: str, sheets: Dict[str, "pd.DataFrame"]):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(sheets, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_file)
+        # Drop entries for earlier versions of the same workbook
+        prefix = _path_prefix(path)
+        for name in os.listdir(CACHE_DIR):
+            stale = os.path.join(CACHE_DIR, name)
+            if name.startswith(prefix + "-") and stale != cache_file:
+                os.remove(stale)
+    except OSError as e:
+        print(f"⚠️ Could not write workbook cache for {path.name}: {e}")
+
+
+def _sheets(path: Path) -> Dict[str, "pd.DataFrame"]:
+    key = workbook_key(path)
+    with _lock:
+        cached = _memory.get(str(path))
+    if cached and cached[0] == key:
+        _stats["memory_hits"] += 1
+        return cached[1]
+
+    cache_file = os.path.join(CACHE_DIR, f"{_path_prefix(path)}-{key}.pkl")
+    sheets = _load_pickle(cache_file) if CACHE_ENABLED else None
+    if sheets is not None:
+        _stats["disk_hits"] += 1
+    else:
+        import pandas as pd
+
+        # One pass over the workbook for every sheet
+        sheets = pd.read_excel(path, sheet_name=None, header=None)
+        _stats["parses"] += 1
+        if CACHE_ENABLED:
+            _store_pickle(path, cache_file, sheets)
+    with _lock:
+        _memory[str(path)] = (key, sheets)
+    return sheets
+
+
+def read_sheets(excel_path, sheet_names: Iterable[str]) -> Dict[str, "pd.DataFrame"]:
+    """The named sheets of a workbook (header=None), parsed at most once per workbook version"""
+    path = Path(excel_path).resolve()
+    sheets = _sheets(path)
+    missing = [name for name in sheet_names if name not in sheets]
+    if missing:
+        raise ValueError(f"Worksheet named {missing[0]!r} not found in {path.name}")
+    # Copies, so a loader that edits its frame cannot change what the next one reads
+    return {name: sheets[name].copy() for name in sheet_names}
+
+
+def read_sheet(excel_path, sheet_name: str) -> "pd.DataFrame":
+    return read_sheets(excel_path, [sheet_name])[sheet_name]
+
+
+def cache_stats() -> dict:
+    return dict(_stats, cache_dir=CACHE_DIR, enabled=CACHE_ENABLED)
+
+
+def clear_memory():
+    with _lock:
+        _memory.clear()
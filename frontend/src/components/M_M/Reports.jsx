@@ -106,8 +106,9 @@ const Reports = ({ onNavigate }) => {
         setMaturityLevels(Array.isArray(mlData) ? mlData : []);
       }
       
-      // Fetch assessments for filtering
-      const assessResponse = await fetch(apiUrl('/api/mm/assessments'));
+      // Fetch assessments for filtering (list fields only - the level notes are not needed here)
+      const assessFields = 'id,dimension_id,shop_unit,overall_count,checked_count,created_at,updated_at';
+      const assessResponse = await fetch(apiUrl(`/api/mm/assessments?fields=${assessFields}`));
       if (assessResponse.ok) {
         const assessData = await assessResponse.json();
         const list = Array.isArray(assessData) ? assessData : [];